@@ -12,10 +12,27 @@ import shutil
 import subprocess
 import tempfile
 import json
+import argparse
+import ctypes
+import math
+import importlib.util
+import importlib.metadata
+from collections import deque
 from pathlib import Path
 
+
+def clone_file(src, dst):
+    """以 APFS clonefile 建立寫入時複製 (copy-on-write) 副本，失敗時回傳 False"""
+    try:
+        libc = ctypes.CDLL('/usr/lib/libSystem.dylib', use_errno=True)
+    except OSError:
+        return False
+    libc.clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    libc.clonefile.restype = ctypes.c_int
+    return libc.clonefile(os.fsencode(str(src)), os.fsencode(str(dst)), 0) == 0
+
 class VideoWrapper2MacBuilder:
-    def __init__(self):
+    def __init__(self, full_clean=False):
         self.project_root = Path(__file__).parent
         self.source_file = self.project_root / "video_wrapper2.py"
         self.assets_dir = self.project_root / "assets"
@@ -23,22 +40,30 @@ class VideoWrapper2MacBuilder:
         self.dist_dir = self.project_root / "dist"  # 使用 PyInstaller 預設的 dist 目錄
         self.app_name = "VideoWrapper2"
         self.app_bundle = self.dist_dir / f"{self.app_name}.app"
+        self.spec_file = self.project_root / f"{self.app_name}.spec"
+        self.full_clean = full_clean
         
         # 清理舊的建置目錄
         self.clean_build_dirs()
         
     def clean_build_dirs(self):
-        """清理舊的建置目錄"""
+        """清理舊的建置目錄（預設保留 build_v2 以供增量建置）"""
         print("🧹 清理舊的建置目錄...")
-        for dir_path in [self.build_dir]:
-            if dir_path.exists():
-                shutil.rmtree(dir_path)
-                print(f"   已刪除: {dir_path}")
+        # 完整清理：刪除 PyInstaller 工作目錄（等同 rm -rf build_v2）
+        if self.full_clean:
+            if self.build_dir.exists():
+                shutil.rmtree(self.build_dir)
+                print(f"   已刪除: {self.build_dir}")
+            self.cleanup_spec_file(self.spec_file)
         
         # 只清理舊的應用程式，保留其他檔案
+        # 先改名移到暫存目錄（APFS 上為 O(1) 中繼資料操作），再於背景刪除
         if self.app_bundle.exists():
-            shutil.rmtree(self.app_bundle)
-            print(f"   已刪除舊的應用程式: {self.app_bundle}")
+            self.dist_dir.mkdir(parents=True, exist_ok=True)
+            trash_dir = Path(tempfile.mkdtemp(prefix='.trash_', dir=self.dist_dir))
+            os.rename(self.app_bundle, trash_dir / self.app_bundle.name)
+            subprocess.Popen(['rm', '-rf', str(trash_dir)])
+            print(f"   已移除舊的應用程式: {self.app_bundle}")
     
     def check_dependencies(self):
         """檢查必要的依賴"""
@@ -49,40 +74,30 @@ class VideoWrapper2MacBuilder:
             raise RuntimeError("需要 Python 3.8 或更高版本")
         print(f"   Python 版本: {sys.version}")
         
-        # 檢查源檔案
-        if not self.source_file.exists():
-            raise RuntimeError(f"找不到源檔案: {self.source_file}")
-        print(f"   源檔案: {self.source_file}")
-        
-        # 檢查 assets
-        if not self.assets_dir.exists():
-            raise RuntimeError(f"找不到 assets 目錄: {self.assets_dir}")
-        print(f"   Assets 目錄: {self.assets_dir}")
-        
-        # 檢查 FFmpeg 二進制檔案
+        # 檢查源檔案、assets 與 FFmpeg 二進制檔案
         ffmpeg_path = self.assets_dir / "bin" / "mac" / "arm64" / "ffmpeg"
         ffprobe_path = self.assets_dir / "bin" / "mac" / "arm64" / "ffprobe"
-        
-        if not ffmpeg_path.exists():
-            raise RuntimeError(f"找不到 FFmpeg: {ffmpeg_path}")
-        if not ffprobe_path.exists():
-            raise RuntimeError(f"找不到 FFprobe: {ffprobe_path}")
+        required = [self.source_file, self.assets_dir, ffmpeg_path, ffprobe_path]
+        missing = [p for p in required if not p.exists()]
+        if missing:
+            raise RuntimeError(f"找不到必要檔案: {', '.join(str(p) for p in missing)}")
+        print(f"   源檔案: {self.source_file}")
+        print(f"   Assets 目錄: {self.assets_dir}")
         print(f"   FFmpeg: {ffmpeg_path}")
         print(f"   FFprobe: {ffprobe_path}")
         
-        # 檢查 PyInstaller
-        try:
-            import PyInstaller
-            print(f"   PyInstaller: {PyInstaller.__version__}")
-        except ImportError:
+        # 檢查 PyInstaller（只確認可匯入，不實際載入模組）
+        if importlib.util.find_spec('PyInstaller') is None:
             raise RuntimeError("請先安裝 PyInstaller: pip install pyinstaller")
+        try:
+            print(f"   PyInstaller: {importlib.metadata.version('pyinstaller')}")
+        except importlib.metadata.PackageNotFoundError:
+            print(f"   PyInstaller: 已安裝")
         
         # 檢查 PyQt6
-        try:
-            import PyQt6
-            print(f"   PyQt6: 已安裝")
-        except ImportError:
+        if importlib.util.find_spec('PyQt6') is None:
             raise RuntimeError("請先安裝 PyQt6: pip install PyQt6")
+        print(f"   PyQt6: 已安裝")
     
     def create_spec_file(self):
         """建立 PyInstaller spec 檔案"""
@@ -104,9 +119,8 @@ a = Analysis(
     ['{self.source_file}'],
     pathex=[],
     binaries=[],
+    # FFmpeg/FFprobe 不經 PyInstaller 複製，建置後以 clonefile 放入 .app
     datas=[
-        ('{self.assets_dir}/bin/mac/arm64/ffmpeg', 'assets/bin/mac/arm64/'),
-        ('{self.assets_dir}/bin/mac/arm64/ffprobe', 'assets/bin/mac/arm64/'),
         ('{self.assets_dir}/app_icon_1024.png', 'assets/'),
     ],
     hiddenimports=[
@@ -135,8 +149,8 @@ exe = EXE(
     name='{self.app_name}',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
+    strip=True,
+    upx=False,  # 啟動程式很小，壓縮效益可忽略
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -150,9 +164,17 @@ coll = COLLECT(
     a.binaries,
     a.zipfiles,
     a.datas,
-    strip=False,
+    strip=True,  # 移除本地符號，減少 COLLECT 複製量
     upx=True,
-    upx_exclude=[],
+    # 大型 Qt/加密函式庫壓縮耗時且易造成簽章失敗，排除於 UPX 之外
+    upx_exclude=[
+        'QtWebEngineCore',
+        'QtQml',
+        'QtQuick',
+        'libcrypto*.dylib',
+        'libssl*.dylib',
+        'Python',
+    ],
     name='{self.app_name}',
 )
 
@@ -194,9 +216,14 @@ app = BUNDLE(
 )
 '''
         
-        spec_file = self.project_root / f"{self.app_name}.spec"
-        with open(spec_file, 'w', encoding='utf-8') as f:
-            f.write(spec_content)
+        spec_file = self.spec_file
+        
+        # 內容未變更時沿用現有 spec，讓 PyInstaller 的快取得以重用
+        if spec_file.exists() and spec_file.read_text(encoding='utf-8') == spec_content:
+            print(f"   Spec 檔案未變更，沿用: {spec_file}")
+            return spec_file
+        
+        spec_file.write_text(spec_content, encoding='utf-8')
         
         print(f"   Spec 檔案已建立: {spec_file}")
         return spec_file
@@ -205,25 +232,57 @@ app = BUNDLE(
         """使用 PyInstaller 建置應用程式"""
         print("🔨 開始建置應用程式...")
         
-        # 執行 PyInstaller
+        # 執行 PyInstaller（預設沿用 build_v2 中的分析快取，加速重複建置）
         cmd = [
             sys.executable, '-m', 'PyInstaller',
-            '--clean',  # 清理快取
             '--noconfirm',  # 不詢問覆寫
-            str(spec_file)
+            '--workpath', str(self.build_dir),  # 工作目錄（增量快取）
         ]
+        if self.full_clean:
+            cmd.append('--clean')  # 清理快取
+        cmd.append(str(spec_file))
         
         print(f"   執行命令: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # 即時輸出建置日誌，只保留最後 200 行供失敗時回報
+        tail = deque(maxlen=200)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            tail.append(line)
+        returncode = proc.wait()
         
-        if result.returncode != 0:
-            print("❌ PyInstaller 建置失敗:")
-            print(result.stdout)
-            print(result.stderr)
+        if returncode != 0:
+            print("❌ PyInstaller 建置失敗（最後輸出）:")
+            print(''.join(tail))
             raise RuntimeError("PyInstaller 建置失敗")
         
         print("✅ PyInstaller 建置成功")
-        print(result.stdout)
+    
+    def install_ffmpeg_binaries(self):
+        """將 FFmpeg/FFprobe 放入應用程式（APFS 上以 clonefile 建立零複製副本）"""
+        print("📦 安裝 FFmpeg 二進制檔案...")
+        src_dir = self.assets_dir / "bin" / "mac" / "arm64"
+        dst_dir = self.app_bundle / "Contents" / "Resources" / "assets" / "bin" / "mac" / "arm64"
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        
+        for name in ("ffmpeg", "ffprobe"):
+            src = src_dir / name
+            dst = dst_dir / name
+            if dst.exists():
+                dst.unlink()
+            if clone_file(src, dst):
+                print(f"   已 clone: {dst}")
+            elif subprocess.run(['cp', '-c', str(src), str(dst)]).returncode == 0:
+                print(f"   已複製 (cp -c): {dst}")
+            else:
+                shutil.copy2(src, dst)
+                print(f"   已複製: {dst}")
+            dst.chmod(dst.stat().st_mode | 0o111)
+        
+        # 新增檔案後重新進行 ad-hoc 簽章，避免 bundle 簽章失效
+        if shutil.which('codesign'):
+            subprocess.run(['codesign', '--force', '--deep', '--sign', '-', str(self.app_bundle)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     
     def verify_app(self):
         """驗證建置的應用程式"""
@@ -260,25 +319,33 @@ app = BUNDLE(
         print(f"   📦 應用程式大小: {self.format_size(app_size)}")
     
     def get_dir_size(self, path):
-        """計算目錄大小"""
+        """計算目錄大小（僅用於顯示；macOS 上使用原生 du 加速）"""
+        if sys.platform == 'darwin':
+            result = subprocess.run(['du', '-sk', '--', str(path)], capture_output=True, text=True)
+            if result.returncode == 0 and result.stdout.split():
+                return int(result.stdout.split()[0]) * 1024
+        return self._walk_dir_size(path)
+    
+    def _walk_dir_size(self, path):
+        """逐檔計算目錄大小（os.scandir 已快取 stat，每個檔案只需一次系統呼叫）"""
         total = 0
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total += os.path.getsize(filepath)
+        stack = [str(path)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
         return total
     
     def format_size(self, size_bytes):
         """格式化檔案大小"""
-        if size_bytes == 0:
+        if size_bytes <= 0:
             return "0B"
-        size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        return f"{size_bytes:.1f}{size_names[i]}"
+        size_names = ["B", "KB", "MB", "GB", "TB"]
+        i = min(int(math.log2(size_bytes) / 10), len(size_names) - 1)
+        return f"{size_bytes / (1 << (10 * i)):.1f}{size_names[i]}"
     
     def cleanup_spec_file(self, spec_file):
         """清理 spec 檔案"""
@@ -295,8 +362,8 @@ app = BUNDLE(
             self.check_dependencies()
             spec_file = self.create_spec_file()
             self.build_app(spec_file)
+            self.install_ffmpeg_binaries()
             self.verify_app()
-            self.cleanup_spec_file(spec_file)
             
             print("=" * 60)
             print("🎉 建置完成！")
@@ -313,7 +380,12 @@ app = BUNDLE(
 
 def main():
     """主函數"""
-    builder = VideoWrapper2MacBuilder()
+    parser = argparse.ArgumentParser(description="建置 VideoWrapper2 Mac 應用程式")
+    parser.add_argument('--full-clean', action='store_true',
+                        help="完整重新建置：刪除 build_v2 並清除 PyInstaller 快取")
+    args = parser.parse_args()
+
+    builder = VideoWrapper2MacBuilder(full_clean=args.full_clean)
     success = builder.build()
     
     if success:
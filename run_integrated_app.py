@@ -15,15 +15,29 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 def main():
     """主函數"""
     try:
-        from video_wrapper2 import VideoEditorFFApp
-        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtWidgets import QApplication, QSplashScreen
+        from PyQt6.QtGui import QPixmap
+        from PyQt6.QtCore import Qt
         
         print("🚀 啟動影片編輯器 v3 整合版本...")
         print("✨ 新功能：支援單次處理與批次處理兩種模式")
         
         app = QApplication(sys.argv)
+        
+        # 先顯示啟動畫面，再載入主程式模組
+        splash = None
+        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'app_icon_1024.png')
+        pixmap = QPixmap(icon_path)
+        if not pixmap.isNull():
+            splash = QSplashScreen(pixmap.scaled(256, 256, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            splash.show()
+            app.processEvents()
+        
+        from video_wrapper2 import VideoEditorFFApp
         win = VideoEditorFFApp()
         win.show()
+        if splash:
+            splash.finish(win)
         
         print("✅ 應用程式已啟動")
         print("📋 使用說明:")
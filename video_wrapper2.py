@@ -12,123 +12,248 @@
 
 import sys
 import os
+import ctypes
 import json
+import hashlib
 import subprocess
+import select
+import shutil
 import tempfile
+import threading
+import time
 import uuid
-import glob
+from array import array
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional
 from pathlib import Path
 
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import JaroWinkler
+except ImportError:  # 未安裝 rapidfuzz 時改用下方純 Python 的 Jaro-Winkler，分數與閾值相同
+    process = None
+    JaroWinkler = None
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout,
-    QGroupBox, QDoubleSpinBox, QTextEdit, QProgressBar, QMessageBox, QCheckBox, QScrollArea, QFrame, QSplitter,
+    QGroupBox, QDoubleSpinBox, QMessageBox, QCheckBox, QScrollArea, QFrame, QSplitter,
     QListView, QStyledItemDelegate, QMenu, QStyle, QTabWidget, QListWidget, QTableWidget, QTableWidgetItem,
     QHeaderView, QComboBox, QLineEdit
 )
-from PyQt6.QtGui import QPixmap, QFont, QImage, QPainter, QColor, QPen, QBrush, QFontMetrics
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QAbstractListModel, QModelIndex, QSize
+from PyQt6.QtGui import QPixmap, QPixmapCache, QFont, QImage, QImageReader, QPainter, QColor, QPen, QBrush, QFontMetrics
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QAbstractListModel, QModelIndex, QSize, QTimer
+try:
+    from AppKit import NSWorkspace  # PyObjC；可直接呼叫 Finder，不必另開 open 程序
+except ImportError:
+    NSWorkspace = None
 
 
 # ==================== 批次模式相關類別 ====================
 
+def _jaro_winkler(s1: str, s2: str, prefix_weight: float = 0.1) -> float:
+    """與 rapidfuzz JaroWinkler.normalized_similarity 相同的計算，供未安裝 rapidfuzz 時使用"""
+    if not s1 or not s2:
+        return 1.0 if s1 == s2 else 0.0
+    len1, len2 = len(s1), len(s2)
+    window = max(0, max(len1, len2) // 2 - 1)
+    flags1 = [False] * len1
+    flags2 = [False] * len2
+    matches = 0
+    for i, ch in enumerate(s1):
+        lo = max(0, i - window)
+        hi = min(len2, i + window + 1)
+        for j in range(lo, hi):
+            if not flags2[j] and s2[j] == ch:
+                flags1[i] = flags2[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    t = 0
+    k = 0
+    for i in range(len1):
+        if flags1[i]:
+            while not flags2[k]:
+                k += 1
+            if s1[i] != s2[k]:
+                t += 1
+            k += 1
+    sim = (matches / len1 + matches / len2 + (matches - t // 2) / matches) / 3
+    if sim > 0.7:  # 與 rapidfuzz 相同，Jaro 分數高於 0.7 才做共同前綴加權
+        prefix = 0
+        for a, b in zip(s1[:4], s2[:4]):
+            if a != b:
+                break
+            prefix += 1
+        sim += prefix * prefix_weight * (1 - sim)
+    return sim
+
+
+def _max_weight_assignment(scores: List[List[float]]) -> List[Tuple[int, int]]:
+    """匈牙利演算法（Kuhn-Munkres，O(n²m)）求總分最高的一對一配對；回傳依列排序的 (列, 欄)。
+    批次檔名只有數十個，純 Python 即可，免為此引入 scipy"""
+    n = len(scores)
+    m = len(scores[0]) if n else 0
+    if not n or not m:
+        return []
+    transposed = n > m
+    if transposed:
+        scores = [list(col) for col in zip(*scores)]
+        n, m = m, n
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)    # p[j]：欄 j 目前配給的列（1 起算，0 表示未配）
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = scores[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = -row[j - 1] - u[i0] - v[j]  # 取負值把最大化轉為最小成本
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    pairs = [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    if transposed:
+        pairs = [(j, i) for i, j in pairs]
+    return sorted(pairs)
+
+
 class FileMatcher:
     """檔案匹配引擎"""
     
+    # Jaro-Winkler 分數整體偏高，閾值相應提高
+    SIMILARITY_THRESHOLD = 0.7
+    
     def __init__(self):
         self.video_extensions = ['.mp4', '.mov', '.mkv', '.avi', '.m4v']
         self.image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff']
+        self._video_ext_set = frozenset(self.video_extensions)
+        self._image_ext_set = frozenset(self.image_extensions)
+    
+    def _scan_folder(self, folder_path: str, ext_set: frozenset) -> List[Tuple[str, str]]:
+        """單次 scandir 列舉資料夾，依小寫副檔名過濾（不逐檔 stat）；回傳 (完整路徑, 小寫主檔名)"""
+        entries = []
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.name.startswith('.'):  # 與 glob 相同，略過隱藏檔（如 ._ AppleDouble）
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() in ext_set and entry.is_file(follow_symlinks=False):
+                    entries.append((entry.path, stem.lower()))
+        entries.sort()
+        return entries
     
-    def scan_videos(self, folder_path: str) -> List[str]:
+    def scan_videos(self, folder_path: str) -> List[Tuple[str, str]]:
         """掃描影片檔案"""
-        videos = []
-        for ext in self.video_extensions:
-            pattern = os.path.join(folder_path, f"*{ext}")
-            videos.extend(glob.glob(pattern))
-            pattern = os.path.join(folder_path, f"*{ext.upper()}")
-            videos.extend(glob.glob(pattern))
-        return sorted(videos)
+        return self._scan_folder(folder_path, self._video_ext_set)
     
-    def scan_images(self, folder_path: str) -> List[str]:
+    def scan_images(self, folder_path: str) -> List[Tuple[str, str]]:
         """掃描圖片檔案"""
-        images = []
-        for ext in self.image_extensions:
-            pattern = os.path.join(folder_path, f"*{ext}")
-            images.extend(glob.glob(pattern))
-            pattern = os.path.join(folder_path, f"*{ext.upper()}")
-            images.extend(glob.glob(pattern))
-        return sorted(images)
+        return self._scan_folder(folder_path, self._image_ext_set)
     
-    def match_exact_names(self, videos: List[str], images: List[str]) -> List[Tuple[str, str]]:
-        """完全檔名匹配"""
+    def match_exact_names(self, videos: List[Tuple[str, str]], images: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """完全檔名匹配（不分大小寫）"""
         matches = []
-        video_basenames = {os.path.splitext(os.path.basename(v))[0]: v for v in videos}
+        video_by_name = {name: path for path, name in videos}
         
-        for image_path in images:
-            image_basename = os.path.splitext(os.path.basename(image_path))[0]
-            if image_basename in video_basenames:
-                matches.append((video_basenames[image_basename], image_path))
+        for image_path, image_name in images:
+            video_path = video_by_name.get(image_name)
+            if video_path:
+                matches.append((video_path, image_path))
         
         return matches
     
-    def match_similar_names(self, videos: List[str], images: List[str]) -> List[Tuple[str, str]]:
-        """相似檔名匹配"""
+    def match_similar_names(self, videos: List[Tuple[str, str]], images: List[Tuple[str, str]],
+                            prefix_weight: float = 0.1,
+                            used_videos: Optional[set] = None,
+                            used_images: Optional[set] = None) -> List[Tuple[str, str]]:
+        """相似檔名匹配；若傳入 used_videos/used_images，會略過其中項目並就地加入新配對"""
+        if used_videos:
+            videos = [v for v in videos if v[0] not in used_videos]
+        if used_images:
+            images = [i for i in images if i[0] not in used_images]
+        if not videos or not images:
+            return []
+        
+        # 主檔名在掃描時已轉小寫，一次算出完整相似度矩陣；低於閾值者為 0
+        video_names = [name for _, name in videos]
+        image_names = [name for _, name in images]
+        threshold = self.SIMILARITY_THRESHOLD
+        if process is not None:
+            scores = process.cdist(
+                video_names, image_names,
+                scorer=JaroWinkler.normalized_similarity,
+                scorer_kwargs={"prefix_weight": prefix_weight},
+                score_cutoff=threshold,
+                workers=-1,
+            ).tolist()
+        else:
+            # 與 cdist 的 score_cutoff 相同：低於閾值記為 0，避免影響配對結果
+            scores = [[sc if sc >= threshold else 0.0
+                       for sc in (_jaro_winkler(v, i, prefix_weight) for i in image_names)]
+                      for v in video_names]
+        
+        # 匈牙利演算法求總相似度最高的一對一配對；分數為 0 的配對不會被採用
         matches = []
-        used_videos = set()
-        used_images = set()
-        
-        for video_path in videos:
-            if video_path in used_videos:
-                continue
-                
-            video_basename = os.path.splitext(os.path.basename(video_path))[0]
-            
-            # 尋找最相似的圖片
-            best_match = None
-            best_score = 0
-            
-            for image_path in images:
-                if image_path in used_images:
-                    continue
-                    
-                image_basename = os.path.splitext(os.path.basename(image_path))[0]
-                score = self.calculate_similarity(video_basename, image_basename)
-                
-                if score > best_score and score > 0.5:  # 相似度閾值
-                    best_score = score
-                    best_match = image_path
-            
-            if best_match:
-                matches.append((video_path, best_match))
-                used_videos.add(video_path)
-                used_images.add(best_match)
+        for i, j in _max_weight_assignment(scores):
+            if scores[i][j] > threshold:  # 相似度閾值
+                video_path, image_path = videos[i][0], images[j][0]
+                matches.append((video_path, image_path))
+                if used_videos is not None:
+                    used_videos.add(video_path)
+                if used_images is not None:
+                    used_images.add(image_path)
         
         return matches
     
-    def match_sequential(self, videos: List[str], images: List[str]) -> List[Tuple[str, str]]:
+    def match_sequential(self, videos: List[Tuple[str, str]], images: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
         """順序匹配"""
         matches = []
         min_len = min(len(videos), len(images))
         
         for i in range(min_len):
-            matches.append((videos[i], images[i]))
+            matches.append((videos[i][0], images[i][0]))
         
         return matches
     
-    def calculate_similarity(self, str1: str, str2: str) -> float:
+    def calculate_similarity(self, str1: str, str2: str, prefix_weight: float = 0.1) -> float:
         """計算字串相似度"""
         if not str1 or not str2:
             return 0.0
         
-        # 簡單的相似度計算：共同字元比例
-        common_chars = set(str1.lower()) & set(str2.lower())
-        total_chars = set(str1.lower()) | set(str2.lower())
-        
-        if not total_chars:
-            return 0.0
-        
-        return len(common_chars) / len(total_chars)
+        # Jaro-Winkler：共同前綴加權，適合 clip_001.mp4 ↔ clip_001.png 這類批次命名
+        if JaroWinkler is None:
+            return _jaro_winkler(str1.lower(), str2.lower(), prefix_weight)
+        return JaroWinkler.normalized_similarity(str1.lower(), str2.lower(), prefix_weight=prefix_weight)
     
     def scan_and_match(self, video_folder: str, image_folder: str) -> List[Tuple[str, str]]:
         """掃描並匹配檔案"""
@@ -140,35 +265,36 @@ class FileMatcher:
         
         # 優先使用完全匹配
         matches = self.match_exact_names(videos, images)
+        used_videos = {m[0] for m in matches}
+        used_images = {m[1] for m in matches}
         
         # 如果完全匹配不足，使用相似匹配
         if len(matches) < min(len(videos), len(images)):
-            remaining_videos = [v for v in videos if v not in [m[0] for m in matches]]
-            remaining_images = [i for i in images if i not in [m[1] for m in matches]]
-            matches.extend(self.match_similar_names(remaining_videos, remaining_images))
+            matches.extend(self.match_similar_names(videos, images, used_videos=used_videos, used_images=used_images))
         
         # 最後使用順序匹配
         if len(matches) < min(len(videos), len(images)):
-            remaining_videos = [v for v in videos if v not in [m[0] for m in matches]]
-            remaining_images = [i for i in images if i not in [m[1] for m in matches]]
+            remaining_videos = [v for v in videos if v[0] not in used_videos]
+            remaining_images = [i for i in images if i[0] not in used_images]
             matches.extend(self.match_sequential(remaining_videos, remaining_images))
         
         return matches
 
 
+@dataclass(slots=True)
 class BatchJobItem:
     """批次工作項目"""
     
-    def __init__(self, job_id: str, video_path: str, image_path: str, output_path: str):
-        self.job_id = job_id
-        self.video_path = video_path
-        self.image_path = image_path
-        self.output_path = output_path
-        self.status = "queued"
-        self.progress = 0
-        self.error_message = None
-        self.started_at = None
-        self.completed_at = None
+    job_id: str
+    video_path: str
+    image_path: str
+    output_path: str
+    status: str = "queued"
+    progress: int = 0
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    probe_info: Optional['ProbeResult'] = None  # 建立批次時預先探測的主片參數
 
 
 class BatchManager:
@@ -177,11 +303,22 @@ class BatchManager:
     def __init__(self):
         self.batches: Dict[str, List[BatchJobItem]] = {}
         self.current_batch_id = None
+        # 各批次的進度陣列與完成數，讓 get_batch_progress 不必逐一掃描工作
+        self._progress: Dict[str, array] = {}
+        self._completed: Dict[str, int] = {}
+        # job_id → 工作 與 (批次, 索引)，進度更新時直接查表
+        self._jobs_by_id: Dict[str, BatchJobItem] = {}
+        self._job_slots: Dict[str, Tuple[str, int]] = {}
+        # 批次工作共用的暫存根目錄；第一個批次開始時才建立
+        self.tmp_root: Optional[str] = None
+        # 可重複使用的工作暫存子目錄（每個同時處理槽一個）
+        self._free_scratch: List[str] = []
     
-    def create_batch(self, matched_pairs: List[Tuple[str, str]], output_folder: str) -> str:
-        """建立批次工作"""
+    def create_batch(self, matched_pairs: List[Tuple[str, str]], output_folder: str, probe_infos: Optional[Dict[str, 'ProbeResult']] = None) -> str:
+        """建立批次工作；probe_infos 為背景預先探測的主片參數（路徑 → ProbeResult）"""
         batch_id = str(uuid.uuid4())
         batch_jobs = []
+        probe_infos = probe_infos or {}
         
         for video_path, image_path in matched_pairs:
             job_id = str(uuid.uuid4())
@@ -189,9 +326,14 @@ class BatchManager:
             output_path = os.path.join(output_folder, output_name)
             
             job = BatchJobItem(job_id, video_path, image_path, output_path)
+            job.probe_info = probe_infos.get(video_path)
+            self._jobs_by_id[job_id] = job
+            self._job_slots[job_id] = (batch_id, len(batch_jobs))
             batch_jobs.append(job)
         
         self.batches[batch_id] = batch_jobs
+        self._progress[batch_id] = array('i', bytes(4 * len(batch_jobs)))
+        self._completed[batch_id] = 0
         self.current_batch_id = batch_id
         return batch_id
     
@@ -203,32 +345,67 @@ class BatchManager:
     
     def update_job_progress(self, job_id: str, progress: int, status: str = None, error: str = None):
         """更新工作進度"""
-        for batch_jobs in self.batches.values():
-            for job in batch_jobs:
-                if job.job_id == job_id:
-                    job.progress = progress
-                    if status:
-                        job.status = status
-                    if error:
-                        job.error_message = error
-                    if progress >= 100:
-                        job.completed_at = datetime.now()
-                    elif progress > 0 and not job.started_at:
-                        job.started_at = datetime.now()
-                    return
+        job = self._jobs_by_id.get(job_id)
+        if not job:
+            return
+        self._set_progress(*self._job_slots[job_id], progress)
+        job.progress = progress
+        if status:
+            job.status = status
+        if error:
+            job.error_message = error
+        if progress >= 100:
+            job.completed_at = datetime.now()
+        elif progress > 0 and not job.started_at:
+            job.started_at = datetime.now()
+    
+    def _set_progress(self, batch_id: str, idx: int, progress: int):
+        """更新進度陣列，並在跨越 100% 時增減完成數"""
+        arr = self._progress[batch_id]
+        old = arr[idx]
+        if old < 100 <= progress:
+            self._completed[batch_id] += 1
+        elif progress < 100 <= old:
+            self._completed[batch_id] -= 1
+        arr[idx] = progress
     
     def get_batch_progress(self, batch_id: str) -> Tuple[int, int, int]:
         """取得批次進度 (完成, 總數, 百分比)"""
         if batch_id not in self.batches:
             return 0, 0, 0
         
-        batch_jobs = self.batches[batch_id]
-        total = len(batch_jobs)
-        completed = sum(1 for job in batch_jobs if job.progress >= 100)
+        total = len(self._progress[batch_id])
+        completed = self._completed[batch_id]
         percentage = int((completed / total) * 100) if total > 0 else 0
         
         return completed, total, percentage
     
+    def ensure_tmp_root(self) -> str:
+        """取得批次暫存根目錄，必要時建立"""
+        if not self.tmp_root:
+            self.tmp_root = tempfile.mkdtemp(prefix="vw2_batch_")
+        return self.tmp_root
+
+    def acquire_scratch(self) -> str:
+        """取得一個工作暫存子目錄；優先重用已歸還的目錄，不必每個工作重新建立"""
+        if self._free_scratch:
+            return self._free_scratch.pop()
+        return tempfile.mkdtemp(prefix="slot_", dir=self.ensure_tmp_root())
+
+    def release_scratch(self, path: str):
+        """歸還工作暫存子目錄（內容已由工作清空）"""
+        if self.tmp_root and path.startswith(self.tmp_root):
+            self._free_scratch.append(path)
+
+    def cleanup(self):
+        """移除批次暫存根目錄（含圖片段快取）"""
+        if not self.tmp_root:
+            return
+        shutil.rmtree(self.tmp_root, ignore_errors=True)
+        drop_segment_locks(self.tmp_root)
+        self.tmp_root = None
+        self._free_scratch.clear()
+    
     @staticmethod
     def generate_output_name(video_path: str) -> str:
         """產生輸出檔案名稱"""
@@ -350,6 +527,19 @@ class BatchSettingsPanel(QWidget):
         
         layout.addWidget(folder_group)
         
+        # 處理設定區塊
+        process_group = QGroupBox("⚙️ 處理設定")
+        process_layout = QHBoxLayout(process_group)
+        process_layout.addWidget(QLabel("同時處理數:"))
+        self.concurrency_combo = QComboBox()
+        cpu_count = os.cpu_count() or 2
+        for n in range(1, cpu_count + 1):
+            self.concurrency_combo.addItem(str(n), n)
+        self.concurrency_combo.setCurrentIndex(max(1, cpu_count // 2) - 1)
+        process_layout.addWidget(self.concurrency_combo)
+        process_layout.addStretch()
+        layout.addWidget(process_group)
+        
         # 掃描按鈕
         self.scan_btn = QPushButton("🔍 掃描檔案")
         self.scan_btn.setEnabled(False)
@@ -379,6 +569,11 @@ class BatchSettingsPanel(QWidget):
             self.output_folder_label.setText(os.path.basename(folder))
             self.check_scan_ready()
     
+    @property
+    def concurrency(self) -> int:
+        """同時執行的 ffmpeg 工作數"""
+        return self.concurrency_combo.currentData() or 1
+    
     def check_scan_ready(self):
         """檢查是否可以掃描"""
         ready = bool(self.video_folder and self.image_folder and self.output_folder)
@@ -395,6 +590,40 @@ class BatchSettingsPanel(QWidget):
 
 # ==================== 原有類別保持不變 ====================
 
+# 子程序啟動參數：符合 CPython 改用 posix_spawn 的條件，避免 fork 複製整個 Qt 行程的位址空間
+# （Python 自行開啟的 fd 預設不可繼承，close_fds=False 不會把它們洩漏給 ffmpeg）
+_SPAWN_KWARGS = {'close_fds': False, 'restore_signals': False}
+
+# Apple Silicon：背景執行緒預設為 utility QoS，其啟動的 ffmpeg 會被排到 E-core。
+# taskpolicy -c 只能往下限制，無法提升，因此改在啟動前把當前執行緒提升為 user-initiated，
+# 讓子程序承接此 QoS。
+QOS_CLASS_USER_INITIATED = 0x19
+_pthread_set_qos = None
+if sys.platform == 'darwin':
+    try:
+        _pthread_set_qos = ctypes.CDLL('/usr/lib/libSystem.B.dylib').pthread_set_qos_class_self_np
+        _pthread_set_qos.argtypes = [ctypes.c_uint, ctypes.c_int]
+        _pthread_set_qos.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _pthread_set_qos = None
+
+
+def _promote_thread_qos():
+    """將呼叫端執行緒提升為 user-initiated QoS（僅 macOS；失敗時忽略）"""
+    if _pthread_set_qos is not None:
+        try:
+            _pthread_set_qos(QOS_CLASS_USER_INITIATED, 0)
+        except Exception:
+            pass
+
+# ffmpeg 偵測結果快取；二進位檔 stat 未變時，下次啟動可略過所有子程序探測
+FFMPEG_ENV_CACHE_FILE = os.path.expanduser("~/Library/Caches/MacVideoWrapper/ffmpeg_env.json")
+# 已知可信的安裝位置；位於此處且可執行的檔案不再另外執行 -version 驗證
+TRUSTED_SYSTEM_BIN_DIRS = ('/opt/homebrew/bin/', '/usr/local/bin/')
+# 各 ffmpeg 路徑的硬體編碼器偵測結果；同一行程內多個 FFmpegEnv 共用，不重複執行 -encoders
+_HW_ENCODERS_CACHE: Dict[str, List[str]] = {}
+
+
 class FFmpegEnv:
     def __init__(self):
         # 1. 獲取內建二進制檔案的候選路徑 (只包含存在的)
@@ -405,23 +634,78 @@ class FFmpegEnv:
         system_ffmpeg_candidates = ['/opt/homebrew/bin/ffmpeg', '/usr/local/bin/ffmpeg', 'ffmpeg']
         system_ffprobe_candidates = ['/opt/homebrew/bin/ffprobe', '/usr/local/bin/ffprobe', 'ffprobe']
 
-        # 3. 按照明確的優先級尋找 FFmpeg 和 FFprobe
-        self.ffmpeg_path = self._find_binary_with_priority(
-            'FFMPEG_BIN',
-            embedded_ffmpeg_candidates,
-            system_ffmpeg_candidates
-        )
-        self.ffprobe_path = self._find_binary_with_priority(
-            'FFPROBE_BIN',
-            embedded_ffprobe_candidates,
-            system_ffprobe_candidates
-        )
-        self.hardware_encoders = self._detect_hardware_encoders()
+        # 3. 環境變數與內建候選都沒變且二進位檔 stat 相同時，直接沿用上次的偵測結果
+        cache_key = {
+            'env': [os.environ.get('FFMPEG_BIN'), os.environ.get('FFPROBE_BIN')],
+            'embedded': [embedded_ffmpeg_candidates, embedded_ffprobe_candidates],
+        }
+        cached = self._load_env_cache(cache_key)
+        if cached:
+            self.ffmpeg_path = cached['ffmpeg_path']
+            self.ffprobe_path = cached['ffprobe_path']
+            self.hardware_encoders = list(cached.get('hardware_encoders') or [])
+        else:
+            # 4. 按照明確的優先級尋找 FFmpeg 和 FFprobe
+            self.ffmpeg_path = self._find_binary_with_priority(
+                'FFMPEG_BIN',
+                embedded_ffmpeg_candidates,
+                system_ffmpeg_candidates
+            )
+            self.ffprobe_path = self._find_binary_with_priority(
+                'FFPROBE_BIN',
+                embedded_ffprobe_candidates,
+                system_ffprobe_candidates
+            )
+            self.hardware_encoders = self._detect_hardware_encoders()
+            self._save_env_cache(cache_key)
         
         # 記錄路徑信息用於調試
         self.ffmpeg_source = self._get_binary_source_info(self.ffmpeg_path, embedded_ffmpeg_candidates)
         self.ffprobe_source = self._get_binary_source_info(self.ffprobe_path, embedded_ffprobe_candidates)
 
+    @staticmethod
+    def _binary_stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load_env_cache(self, cache_key):
+        """讀取偵測結果快取；key 或任一二進位檔的 (mtime, size) 不符即視為失效"""
+        try:
+            with open(FFMPEG_ENV_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('key') != cache_key:
+            return None
+        for name in ('ffmpeg', 'ffprobe'):
+            path = data.get(f'{name}_path')
+            if not path or self._binary_stat(path) != data.get(f'{name}_stat'):
+                return None
+        return data
+
+    def _save_env_cache(self, cache_key):
+        if not (self.ffmpeg_path and self.ffprobe_path):
+            return
+        data = {
+            'key': cache_key,
+            'ffmpeg_path': self.ffmpeg_path,
+            'ffmpeg_stat': self._binary_stat(self.ffmpeg_path),
+            'ffprobe_path': self.ffprobe_path,
+            'ffprobe_stat': self._binary_stat(self.ffprobe_path),
+            'hardware_encoders': self.hardware_encoders,
+        }
+        try:
+            os.makedirs(os.path.dirname(FFMPEG_ENV_CACHE_FILE), exist_ok=True)
+            tmp_path = f"{FFMPEG_ENV_CACHE_FILE}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, FFMPEG_ENV_CACHE_FILE)
+        except OSError as e:
+            print(f"DEBUG: 無法寫入 FFmpeg 偵測快取: {e}")
+
     def _app_base_dir(self):
         """獲取應用程式基礎目錄，優先考慮 .app 結構 (增強穩健性)"""
         # PyInstaller 打包後：有 sys._MEIPASS
@@ -498,73 +782,78 @@ class FFmpegEnv:
                         potential_candidates.append(internal_path / 'assets' / 'bin' / bin_name)
                     break
 
-        # 過濾掉不存在的路徑，只保留實際存在的
+        # 過濾掉不存在的路徑，只保留實際存在的；每個目錄只 scandir 一次，不逐一 stat 候選
+        dir_entries = {}
         existing_candidates = []
         for p in potential_candidates:
-            if p.is_file() and os.access(p, os.X_OK):
-                existing_candidates.append(str(p))
-                print(f"DEBUG: 找到並可執行內建候選: {p}")
-            elif p.is_file():
-                print(f"DEBUG: 找到但不可執行內建候選: {p}")
+            parent = str(p.parent)
+            if parent not in dir_entries:
+                try:
+                    with os.scandir(parent) as it:
+                        dir_entries[parent] = {e.name: e for e in it}
+                except OSError:
+                    dir_entries[parent] = {}
+            entry = dir_entries[parent].get(p.name)
+            if entry is not None and entry.is_file():
+                if entry.stat().st_mode & 0o111:
+                    existing_candidates.append(str(p))
+                    print(f"DEBUG: 找到並可執行內建候選: {p}")
+                else:
+                    print(f"DEBUG: 找到但不可執行內建候選: {p}")
             else:
                 print(f"DEBUG: 內建候選不存在: {p}")
 
         return existing_candidates
 
+    def _verify_binary(self, path: str, trusted: bool) -> bool:
+        """可執行即視為可用；僅對非可信來源執行一次 -version 驗證"""
+        if not (Path(path).is_file() and os.access(path, os.X_OK)):
+            return False
+        if trusted:
+            return True
+        try:
+            subprocess.run([path, '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=2, **_SPAWN_KWARGS)
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            print(f"DEBUG: ❌ 二進制檔案執行失敗: {path} - {e}")
+            return False
+
     def _find_binary_with_priority(self, env_key: str, embedded_candidates: List[str], system_candidates: List[str]) -> Optional[str]:
         """按照明確的優先級尋找二進制檔案：環境變數 -> 內建 -> 系統"""
         print(f"DEBUG: 正在尋找 {env_key} (優先級: 環境變數 -> 內建 -> 系統)")
-        # 1. 檢查環境變數
+        # 1. 檢查環境變數（使用者自訂路徑，需實際執行驗證）
         env_val = os.environ.get(env_key)
         if env_val:
             print(f"DEBUG: 檢查環境變數 {env_key}={env_val}")
-            if Path(env_val).is_file() and os.access(env_val, os.X_OK):
-                try:
-                    res = subprocess.run([env_val, '-version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=True)
-                    print(f"DEBUG: ✅ 環境變數 {env_key} 指向的二進制檔案可用: {env_val}")
-                    return env_val
-                except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                    print(f"DEBUG: ❌ 環境變數 {env_key} 指向的二進制檔案執行失敗或找不到: {env_val} - {e}")
-            else:
-                print(f"DEBUG: 環境變數 {env_key} 指向的檔案不存在或不可執行: {env_val}")
+            if self._verify_binary(env_val, trusted=False):
+                print(f"DEBUG: ✅ 環境變數 {env_key} 指向的二進制檔案可用: {env_val}")
+                return env_val
+            print(f"DEBUG: 環境變數 {env_key} 指向的檔案不存在或不可用: {env_val}")
 
-        # 2. 檢查內建候選路徑
+        # 2. 檢查內建候選路徑（隨 App 打包，可執行即可信）
         print(f"DEBUG: 檢查內建候選路徑: {embedded_candidates}")
         for c in embedded_candidates:
-            if Path(c).is_file() and os.access(c, os.X_OK):
-                try:
-                    res = subprocess.run([c, '-version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=True)
-                    print(f"DEBUG: ✅ 內建二進制檔案可用: {c}")
-                    return c
-                except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                    print(f"DEBUG: ❌ 內建二進制檔案執行失敗或找不到: {c} - {e}")
-            else:
-                print(f"DEBUG: 內建二進制檔案不存在或不可執行: {c}")
+            if self._verify_binary(c, trusted=True):
+                print(f"DEBUG: ✅ 內建二進制檔案可用: {c}")
+                return c
+            print(f"DEBUG: 內建二進制檔案不存在或不可執行: {c}")
 
         # 3. 檢查系統候選路徑
         print(f"DEBUG: 檢查系統候選路徑: {system_candidates}")
         for c in system_candidates:
-            current_path = Path(c)
-            if not current_path.is_absolute(): # 處理相對路徑 (e.g. 'ffmpeg')
-                try:
-                    which_result = subprocess.run(['which', c], capture_output=True, text=True, check=True)
-                    full_path = which_result.stdout.strip()
-                    if full_path:
-                        current_path = Path(full_path)
-                        print(f"DEBUG: 'which {c}' 找到路徑: {current_path}")
-                except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                    print(f"DEBUG: 'which {c}' 執行失敗或找不到: {e}")
+            full_path = c
+            if not os.path.isabs(c):  # 處理相對路徑 (e.g. 'ffmpeg')
+                full_path = shutil.which(c)
+                if not full_path:
+                    print(f"DEBUG: PATH 中找不到 {c}")
                     continue
-            
-            if current_path.is_file() and os.access(current_path, os.X_OK):
-                try:
-                    res = subprocess.run([str(current_path), '-version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=True)
-                    print(f"DEBUG: ✅ 系統二進制檔案可用: {current_path}")
-                    return str(current_path)
-                except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                    print(f"DEBUG: ❌ 系統二進制檔案執行失敗或找不到: {current_path} - {e}")
-            else:
-                print(f"DEBUG: 系統二進制檔案不存在或不可執行: {current_path}")
+                print(f"DEBUG: PATH 中找到 {c}: {full_path}")
+
+            trusted = full_path.startswith(TRUSTED_SYSTEM_BIN_DIRS)
+            if self._verify_binary(full_path, trusted):
+                print(f"DEBUG: ✅ 系統二進制檔案可用: {full_path}")
+                return full_path
+            print(f"DEBUG: 系統二進制檔案不存在或不可用: {full_path}")
 
         print(f"DEBUG: ❌ 未找到 {env_key} 的可用二進制檔案")
         return None
@@ -581,16 +870,20 @@ class FFmpegEnv:
         return f"其他 ({found_path})"
 
     def _detect_hardware_encoders(self):
+        if self.ffmpeg_path in _HW_ENCODERS_CACHE:
+            return list(_HW_ENCODERS_CACHE[self.ffmpeg_path])
         enc = []
         try:
             # 在嘗試執行之前，先檢查路徑是否存在且可執行
             if self.ffmpeg_path and os.path.exists(self.ffmpeg_path) and os.access(self.ffmpeg_path, os.X_OK):
-                p = subprocess.run([self.ffmpeg_path, '-hide_banner', '-encoders'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                out = p.stdout or ''
-                if 'h264_videotoolbox' in out:
+                # 只需在輸出中搜尋編碼器名稱，直接比對位元組，不解碼為字串
+                p = subprocess.run([self.ffmpeg_path, '-hide_banner', '-encoders'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, **_SPAWN_KWARGS)
+                out = p.stdout or b''
+                if b'h264_videotoolbox' in out:
                     enc.append('h264_videotoolbox')
-                if 'hevc_videotoolbox' in out:
+                if b'hevc_videotoolbox' in out:
                     enc.append('hevc_videotoolbox')
+                _HW_ENCODERS_CACHE[self.ffmpeg_path] = list(enc)
             else:
                 print(f"警告: FFmpeg 路徑不可用或不可執行: {self.ffmpeg_path}")
         except Exception as e:
@@ -636,8 +929,14 @@ def _parse_fraction(frac):
 def probe_main_video(probe_bin, video_path):
     r = ProbeResult()
     try:
-        cmd = [probe_bin, '-v', 'error', '-print_format', 'json', '-show_streams', '-show_format', video_path]
-        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        # 只要求實際用到的欄位，減少 ffprobe 輸出與 JSON 解析量
+        entries = (
+            'stream=codec_type,codec_name,profile,level,width,height,pix_fmt,avg_frame_rate,r_frame_rate,'
+            'colorspace,color_primaries,color_transfer,sample_aspect_ratio,display_aspect_ratio,sample_rate,channels'
+            ':format=duration'
+        )
+        cmd = [probe_bin, '-v', 'error', '-print_format', 'json', '-show_entries', entries, video_path]
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, **_SPAWN_KWARGS)
         if p.returncode != 0:
             return r
         data = json.loads(p.stdout)
@@ -674,13 +973,137 @@ def probe_main_video(probe_bin, video_path):
     return r
 
 
+PROBE_CACHE_MAX_ENTRIES = 256
+# (ffprobe, 路徑, mtime, 大小) → ProbeResult；只保存成功的結果，暫時性失敗下次仍會重新探測
+_PROBE_CACHE: "OrderedDict[tuple, ProbeResult]" = OrderedDict()
+_PROBE_CACHE_LOCK = threading.Lock()
+
+
+def probe_main_video_cached(probe_bin, video_path) -> ProbeResult:
+    """以 (路徑, mtime, 大小) 為鍵快取探測結果；同一來源重複排入佇列時不再啟動 ffprobe"""
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return probe_main_video(probe_bin, video_path)
+    key = (probe_bin, video_path, st.st_mtime_ns, st.st_size)
+    with _PROBE_CACHE_LOCK:
+        cached = _PROBE_CACHE.get(key)
+        if cached is not None:
+            _PROBE_CACHE.move_to_end(key)
+            return cached
+    result = probe_main_video(probe_bin, video_path)
+    if result.video_codec is not None:
+        with _PROBE_CACHE_LOCK:
+            _PROBE_CACHE[key] = result
+            while len(_PROBE_CACHE) > PROBE_CACHE_MAX_ENTRIES:
+                _PROBE_CACHE.popitem(last=False)
+    return result
+
+
+def probe_many(probe_bin, paths: List[str]) -> List[ProbeResult]:
+    """平行探測多支影片；ffprobe 以讀取檔頭為主，多個程序重疊執行可攤平啟動成本"""
+    if not paths:
+        return []
+    workers = min(8, os.cpu_count() or 1, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: probe_main_video_cached(probe_bin, path), paths))
+
+
+# VideoToolbox 同時編碼 session 上限；跨工作與工作內平行段落共用
+VT_MAX_SESSIONS = 2
+_VT_SESSIONS = threading.BoundedSemaphore(VT_MAX_SESSIONS)
+
+
+def _encoder_slot(encoder: str):
+    """VideoToolbox 編碼需先取得 session 名額，其他編碼器不受限"""
+    return _VT_SESSIONS if encoder.endswith('_videotoolbox') else nullcontext()
+
+
+SILENCE_CACHE_DIR = os.path.expanduser("~/Library/Caches/MacVideoWrapper/silence")
+_SILENCE_LOCK = threading.Lock()
+# 圖片段快取：批次中重複使用同一張圖卡時只需編碼一次；放在批次暫存根目錄下，隨批次清除
+SEGMENT_CACHE_SUBDIR = "segments"
+_SEGMENT_LOCKS: Dict[str, Dict[str, threading.Lock]] = {}  # 暫存根目錄 → {快取鍵: 鎖}
+_SEGMENT_LOCKS_GUARD = threading.Lock()
+
+
+def _segment_lock(root: str, key: str) -> threading.Lock:
+    """同一圖片段同時只讓一個工作編碼，其餘等待後直接取用結果"""
+    with _SEGMENT_LOCKS_GUARD:
+        return _SEGMENT_LOCKS.setdefault(root, {}).setdefault(key, threading.Lock())
+
+
+def drop_segment_locks(root: str):
+    """批次暫存根目錄移除時一併釋放其鎖表"""
+    with _SEGMENT_LOCKS_GUARD:
+        _SEGMENT_LOCKS.pop(root, None)
+
+
+def get_silence_ts(ffmpeg_bin, sample_rate, duration_sec) -> Optional[str]:
+    """取得指定取樣率與長度的靜音 AAC TS；同參數只編碼一次，供所有工作以 -c:a copy 共用"""
+    path = os.path.join(SILENCE_CACHE_DIR, f"silence_{int(sample_rate)}_{duration_sec:.3f}.ts")
+    with _SILENCE_LOCK:
+        if os.path.exists(path):
+            return path
+        try:
+            os.makedirs(SILENCE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            cmd = [
+                ffmpeg_bin, '-hide_banner', '-v', 'error', '-y',
+                '-f', 'lavfi', '-t', f"{duration_sec:.3f}", '-i', f"anullsrc=r={int(sample_rate)}:cl=stereo",
+                '-c:a', 'aac', '-b:a', '192k', '-ar', str(int(sample_rate)), '-ac', '2',
+                '-f', 'mpegts', tmp_path
+            ]
+            p = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_SPAWN_KWARGS)
+            if p.returncode != 0:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+            os.replace(tmp_path, path)
+            return path
+        except OSError:
+            return None
+
+
+def _build_fused_graph(shape: Tuple[str, ...], has_audio: bool) -> str:
+    """依段落形狀產生 filter_complex 範本；S/E 為靜態圖（有音訊時各帶一個 anullsrc 輸入），M 為主片"""
+    filters = []
+    pads = []
+    idx = 0
+    for seg in shape:
+        label = seg.lower()
+        vf = '{main_vf}' if seg == 'M' else '{still_vf}'
+        filters.append(f"[{idx}:v]{vf}[v{label}]")
+        pads.append(f"[v{label}]")
+        if has_audio:
+            # 主片音訊來自同一輸入；靜態圖的靜音則是緊接其後的 anullsrc 輸入
+            a_idx = idx if seg == 'M' else idx + 1
+            filters.append(f"[{a_idx}:a]{{audio_fmt}}[a{label}]")
+            pads.append(f"[a{label}]")
+        idx += 1 if (seg == 'M' or not has_audio) else 2
+    filters.append(''.join(pads) + f"concat=n={len(shape)}:v=1:a={int(has_audio)}[v]" + ("[a]" if has_audio else ''))
+    return ';'.join(filters)
+
+
+# 單一程序轉檔常見的四種段落形狀；以 (形狀, 是否有音訊) 為鍵，方便逐圖調校
+_FILTER_GRAPHS = {
+    (shape, has_audio): _build_fused_graph(shape, has_audio)
+    for shape in (('S', 'M', 'E'), ('M', 'E'), ('S', 'M'), ('M',))
+    for has_audio in (True, False)
+}
+
+
+# 這些容器本身已是 Annex B（start code）格式，remux 成 TS 不需 mp4toannexb 逐一走訪 NAL
+ANNEXB_EXTS = frozenset({'.ts', '.mts', '.m2ts', '.h264', '.264', '.hevc', '.h265', '.265'})
+
+
 class FFmpegWrapperProcessor(QThread):
     progress = pyqtSignal(str, int)
     status = pyqtSignal(str, str)
     job_finished = pyqtSignal(str, str)
     error = pyqtSignal(str, str)
 
-    def __init__(self, job_id, video_file, start_image, end_image, start_duration, end_duration, output_file, prefer_copy_concat=True, use_hardware=True, env: FFmpegEnv | None = None):
+    def __init__(self, job_id, video_file, start_image, end_image, start_duration, end_duration, output_file, prefer_copy_concat=True, use_hardware=True, env: FFmpegEnv | None = None, probe_info: ProbeResult | None = None, threads: int = 0, tmp_root: str | None = None, scratch_dir: str | None = None):
         super().__init__()
         self.job_id = job_id
         self.video_file = video_file
@@ -692,139 +1115,377 @@ class FFmpegWrapperProcessor(QThread):
         self.prefer_copy_concat = prefer_copy_concat
         self.use_hardware = use_hardware
         self.env = env or FFmpegEnv()
+        self.probe_info = probe_info
+        self.threads = threads  # 每個 ffmpeg 的編碼執行緒數；0 表示交由 ffmpeg 自動決定
+        self.tmp_root = tmp_root  # 批次共用的暫存根目錄（圖片段快取）；None 表示單檔模式
+        self.scratch_dir = scratch_dir  # 批次分配的可重用暫存目錄；None 時自行建立並於結束時刪除
         self.is_cancelled = False
-        self._running_proc = None
+        self._running_procs = set()  # 圖片段與主片可能平行執行，取消時需全部終止
         self._tmp_dir = None
+        self._last_progress = -1
+        self._last_progress_time = 0.0
+        self._scaled_images = {}
 
     def cancel(self):
         self.is_cancelled = True
-        try:
-            if self._running_proc and self._running_proc.poll() is None:
-                self._running_proc.kill()
-        except Exception:
-            pass
+        for proc in list(self._running_procs):
+            try:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()  # SIGKILL 後立即返回，順便回收子程序避免殭屍
+            except Exception:
+                pass
 
-    def _run_cmd(self, cmd):
+    def _run_cmd(self, cmd, duration_sec=0.0, progress_span=None):
+        """執行 ffmpeg；提供 duration_sec 與 progress_span (起, 迄) 時，依 -progress 輸出回報實際進度"""
+        track = bool(progress_span) and duration_sec and duration_sec > 0
+        if track:
+            cmd = cmd[:1] + ['-progress', 'pipe:1', '-nostats'] + cmd[1:]
+        proc = None
         try:
-            self._running_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            _promote_thread_qos()
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1 << 20, **_SPAWN_KWARGS)
+            self._running_procs.add(proc)
+            fd = proc.stdout.fileno()
+            pending = b''
             while True:
                 if self.is_cancelled:
                     try:
-                        self._running_proc.kill()
+                        proc.kill()
+                        proc.wait()
                     except Exception:
                         pass
                     return False
-                line = self._running_proc.stdout.readline() if self._running_proc.stdout else ''
-                if not line and self._running_proc.poll() is not None:
+                # 以 select 等待資料（逾時仍可檢查取消），每次整塊讀取而非逐行
+                ready, _, _ = select.select([fd], [], [], 0.1)
+                if not ready:
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
                     break
-            return self._running_proc.returncode == 0
+                if not track:
+                    continue
+                pending += chunk
+                *lines, pending = pending.split(b'\n')
+                # 同一塊內只需回報最新的時間點
+                for line in reversed(lines):
+                    if line.startswith(b'out_time_ms='):
+                        self._emit_cmd_progress(line.decode('ascii', 'ignore'), duration_sec, progress_span)
+                        break
+            proc.wait()
+            return proc.returncode == 0
         except Exception:
             return False
         finally:
-            self._running_proc = None
+            self._running_procs.discard(proc)
+            if proc is not None:
+                if proc.poll() is None:
+                    # 例外中途離開時不留下仍在執行的 ffmpeg
+                    try:
+                        proc.kill()
+                        proc.wait()
+                    except Exception:
+                        pass
+                if proc.stdout:
+                    proc.stdout.close()
 
-    def _encode_image_ts(self, image_path, duration_sec, fps, has_audio, audio_sr, audio_ch):
+    def _emit_cmd_progress(self, line, duration_sec, progress_span):
+        # out_time_ms 實際單位為微秒
+        try:
+            t_us = int(line.split('=', 1)[1])
+        except ValueError:
+            return
+        lo, hi = progress_span
+        frac = max(0.0, min(1.0, t_us / (duration_sec * 1_000_000)))
+        pct = lo + int((hi - lo) * frac)
+        # 百分比有變化且距上次回報至少 100ms 才送出，減少跨執行緒訊號
+        now = time.monotonic()
+        if pct != self._last_progress and now - self._last_progress_time >= 0.1:
+            self._last_progress = pct
+            self._last_progress_time = now
+            self.progress.emit(self.job_id, pct)
+
+    def _encode_image_ts(self, image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span=None, codec='h264'):
+        """編碼圖片段；批次內參數與編碼設定完全相同的段落跨工作共用同一個 TS"""
+        if not self.tmp_root:
+            # 單檔模式沒有批次暫存根目錄，不做跨工作快取
+            return self._encode_image_ts_fresh(image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span, codec)
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None
+        encoder = self._still_encoder(codec)
+        # 鍵含實際編碼器與其參數，切換 VT/HEVC/x264 或調整參數時不會取到舊段落
+        params = (os.path.abspath(image_path), st.st_mtime_ns, st.st_size, round(duration_sec, 3), fps,
+                  has_audio, audio_sr, audio_ch, codec, encoder,
+                  tuple(self._still_video_args(encoder, self._still_gop(fps, duration_sec))))
+        key = hashlib.sha256(repr(params).encode('utf-8')).hexdigest()[:16]
+        cache_dir = os.path.join(self.tmp_root, SEGMENT_CACHE_SUBDIR)
+        cached_path = os.path.join(cache_dir, f"{key}.ts")
+
+        with _segment_lock(self.tmp_root, key):
+            if os.path.exists(cached_path):
+                return cached_path
+            out_path = self._encode_image_ts_fresh(image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span, codec)
+            if not out_path:
+                return None
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                shutil.move(out_path, cached_path)
+                return cached_path
+            except OSError:
+                return out_path
+
+    def _still_encoder(self, codec):
+        """圖片段優先使用的編碼器（hevc 只有 VideoToolbox 可用）"""
+        if codec == 'hevc':
+            return 'hevc_videotoolbox'
+        if self.use_hardware and ('h264_videotoolbox' in self.env.hardware_encoders):
+            return 'h264_videotoolbox'
+        return 'libx264'
+
+    @staticmethod
+    def _still_gop(fps, duration_sec):
+        # 靜止畫面整段只放一個 IDR，其後皆為無 B 幀、單參考的全 skip P 幀，幾乎不耗編碼量
+        return max(2, int(round((fps if fps and fps > 0 else 30) * duration_sec)) + 1)
+
+    @staticmethod
+    def _still_video_args(encoder, gop):
+        if encoder == 'hevc_videotoolbox':
+            return ['-c:v', 'hevc_videotoolbox', '-profile:v', 'main', '-g', str(gop), '-bf', '0', '-b:v', '8M', '-allow_sw', '1', '-realtime', '0']
+        if encoder == 'h264_videotoolbox':
+            return ['-c:v', 'h264_videotoolbox', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-bf', '0', '-b:v', '8M', '-allow_sw', '1', '-realtime', '0']
+        return ['-c:v', 'libx264', '-tune', 'stillimage', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-bf', '0', '-refs', '1', '-sc_threshold', '0']
+
+    def _encode_image_ts_fresh(self, image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span=None, codec='h264'):
+        # 圖片段需與 HEVC 主片同編碼才能 -c copy 串接，hevc 僅 VideoToolbox 提供，不回退
+        encoder = self._still_encoder(codec)
+        out_path = self._encode_image_ts_with(encoder, image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span)
+        if not out_path and encoder == 'h264_videotoolbox' and not self.is_cancelled:
+            # 硬體編碼失敗時回退 libx264
+            out_path = self._encode_image_ts_with('libx264', image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span)
+        return out_path
+
+    def _prescale_image(self, image_path):
+        """將圖片預先縮放為 1920x1080 PNG（每張圖只做一次），回傳 (路徑, 濾鏡)"""
+        if image_path in self._scaled_images:
+            return self._scaled_images[image_path]
+        result = (image_path, "scale=1920:1080:flags=bilinear,format=yuv420p")
+        img = QImage(image_path)
+        if not img.isNull():
+            scaled_path = os.path.join(self._tmp_dir, f"still_{uuid.uuid4().hex}.png")
+            scaled = img.scaled(1920, 1080, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            if scaled.save(scaled_path, "PNG"):
+                result = (scaled_path, "format=yuv420p")
+        self._scaled_images[image_path] = result
+        return result
+
+    def _encode_image_ts_with(self, encoder, image_path, duration_sec, fps, has_audio, audio_sr, audio_ch, progress_span=None):
         out_path = os.path.join(self._tmp_dir, f"seg_{uuid.uuid4().hex}.ts")
-        gop = max(2, int(round(fps * 2))) if fps and fps > 0 else 60
-        vf = f"scale=1920:1080:flags=lanczos,format=yuv420p"
+        gop = self._still_gop(fps, duration_sec)
+        image_path, vf = self._prescale_image(image_path)
 
         cmd = [
             self.env.ffmpeg_path, '-hide_banner', '-y',
             '-loop', '1', '-framerate', str(int(round(fps))) if fps and fps > 0 else '30', '-t', f"{duration_sec:.3f}", '-i', image_path,
         ]
 
-        if has_audio:
+        # 靜音音軌改用共用的預先編碼 TS 直接複製，省去每段重新編碼 AAC
+        silence_ts = get_silence_ts(self.env.ffmpeg_path, audio_sr, duration_sec) if has_audio else None
+        if silence_ts:
+            cmd += ['-i', silence_ts]
+        elif has_audio:
             cmd += ['-f', 'lavfi', '-t', f"{duration_sec:.3f}", '-i', f"anullsrc=r={audio_sr}:cl={'stereo' if audio_ch != 1 else 'mono'}"]
 
         cmd += [
             '-r', str(int(round(fps))) if fps and fps > 0 else '30',
             '-vf', vf,
             '-colorspace', 'bt709', '-color_primaries', 'bt709', '-color_trc', 'bt709',
-            '-c:v', 'libx264', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-sc_threshold', '0',
         ]
 
-        if has_audio:
+        cmd += self._still_video_args(encoder, gop)
+
+        if silence_ts:
+            cmd += ['-map', '0:v', '-map', '1:a', '-c:a', 'copy']
+        elif has_audio:
             cmd += ['-c:a', 'aac', '-b:a', '192k', '-ar', str(audio_sr), '-ac', '2']
 
-        cmd += [
+        cmd += self._thread_args() + [
             '-f', 'mpegts', out_path
         ]
 
-        return out_path if self._run_cmd(cmd) else None
+        with _encoder_slot(encoder):
+            return out_path if self._run_cmd(cmd, duration_sec, progress_span) else None
+
+    def _thread_args(self):
+        # 多個工作同時執行時限制每個 ffmpeg 的執行緒，避免彼此搶核心
+        return ['-threads', str(self.threads)] if self.threads > 0 else []
 
-    def _mux_main_to_ts(self):
+    def _mux_main_to_ts(self, duration_sec=0.0, progress_span=None, codec='h264'):
         out_path = os.path.join(self._tmp_dir, f"main_{uuid.uuid4().hex}.ts")
         cmd = [
             self.env.ffmpeg_path, '-hide_banner', '-y',
             '-i', self.video_file,
-            '-c', 'copy', '-bsf:v', 'h264_mp4toannexb',
-            '-f', 'mpegts', out_path
+            '-c', 'copy',
         ]
-        return out_path if self._run_cmd(cmd) else None
+        if os.path.splitext(self.video_file)[1].lower() not in ANNEXB_EXTS:
+            cmd += ['-bsf:v', f"{codec}_mp4toannexb"]
+        cmd += ['-f', 'mpegts', out_path]
+        return out_path if self._run_cmd(cmd, duration_sec, progress_span) else None
 
-    def _concat_ts_to_mp4(self, ts_list, output_path):
+    def _concat_ts_to_mp4(self, ts_list, output_path, duration_sec=0.0, progress_span=None, codec='h264'):
         list_txt = os.path.join(self._tmp_dir, 'list.txt')
         with open(list_txt, 'w', encoding='utf-8') as f:
-            for p in ts_list:
-                f.write(f"file '{p}'\n")
+            f.write(''.join(f"file '{p}'\n" for p in ts_list))
         cmd = [
             self.env.ffmpeg_path, '-hide_banner', '-y',
-            '-f', 'concat', '-safe', '0', '-i', list_txt,
+            '-f', 'concat', '-safe', '0', '-thread_queue_size', '4096', '-fflags', '+genpts', '-i', list_txt,
             '-c', 'copy', '-bsf:a', 'aac_adtstoasc', '-movflags', '+faststart',
-            output_path
         ]
-        return self._run_cmd(cmd)
-
-    def _transcode_fallback(self, main_info: ProbeResult, output_path):
+        if codec == 'hevc':
+            cmd += ['-tag:v', 'hvc1']  # QuickTime 只認 hvc1 標記的 HEVC
+        cmd += [output_path]
+        return self._run_cmd(cmd, duration_sec, progress_span)
+
+    def _transcode_fallback(self, main_info: ProbeResult, output_path, progress_span=None):
+        # 主片可直接串流複製的情況已由 run() 的路線 A 處理，這裡一律重編碼
+        codec = 'hevc' if (main_info.video_codec == 'hevc' and self.use_hardware
+                           and 'hevc_videotoolbox' in self.env.hardware_encoders) else 'h264'
         fps = int(round(main_info.fps)) if main_info.fps and main_info.fps > 0 else 30
-        gop = max(2, int(round(fps * 2)))
 
-        inputs = ['-i', self.video_file]
-        if self.start_image:
-            inputs += ['-loop', '1', '-t', f"{self.start_duration:.3f}", '-i', self.start_image]
-        if self.end_image:
-            inputs += ['-loop', '1', '-t', f"{self.end_duration:.3f}", '-i', self.end_image]
+        # 先以單一 ffmpeg 一次完成縮放、串接與編碼，不產生中介 TS
+        if self._transcode_fused(main_info, output_path, fps, codec, progress_span):
+            return True
+        if self.is_cancelled:
+            return False
 
-        filters = []
-        idx = 1
+        # 單次流程失敗時改為多段：主片以單一輸入 -vf 重編碼為 TS，開頭/結尾沿用 _encode_image_ts，最後 concat demuxer 串接
+        lo, hi = progress_span or (0, 100)
+        main_hi = lo + (hi - lo) * 7 // 10
+        image_hi = lo + (hi - lo) * 9 // 10
+
+        main_ts = self._transcode_main_to_ts(main_info, fps, codec, (lo, main_hi))
+        if not main_ts and codec == 'hevc' and not self.is_cancelled:
+            # HEVC 硬體編碼失敗時整段改以 H.264 輸出
+            codec = 'h264'
+            main_ts = self._transcode_main_to_ts(main_info, fps, codec, (lo, main_hi))
+        if not main_ts:
+            return False
+        seq = [main_ts]
         if self.start_image:
-            filters.append(f"[{idx}:v]scale=1920:1080:flags=lanczos,format=yuv420p[s]")
-            idx += 1
-        filters.append(f"[0:v]scale=1920:1080:flags=bicubic,format=yuv420p[mv]")
+            ts = self._encode_image_ts(self.start_image, self.start_duration, fps, main_info.has_audio,
+                                       main_info.audio_sample_rate, main_info.audio_channels, (main_hi, image_hi), codec)
+            if not ts:
+                return False
+            seq.insert(0, ts)
         if self.end_image:
-            filters.append(f"[{idx}:v]scale=1920:1080:flags=lanczos,format=yuv420p[e]")
+            ts = self._encode_image_ts(self.end_image, self.end_duration, fps, main_info.has_audio,
+                                       main_info.audio_sample_rate, main_info.audio_channels, (main_hi, image_hi), codec)
+            if not ts:
+                return False
+            seq.append(ts)
+        total = (main_info.duration or 0.0) + (self.start_duration if self.start_image else 0.0) + (self.end_duration if self.end_image else 0.0)
+        return self._concat_ts_to_mp4(seq, output_path, total, (image_hi, hi), codec)
+
+    def _transcode_fused(self, main_info: ProbeResult, output_path, fps, codec, progress_span=None):
+        """單一 ffmpeg 程序完成開頭圖 + 主片 + 結尾圖的縮放、串接與編碼"""
+        has_audio = main_info.has_audio
+        sr = main_info.audio_sample_rate or 48000
+        gop = max(2, int(round(fps * 2)))
+        still_vf = f"scale=1920:1080:flags=bilinear,format=yuv420p,fps={fps},setsar=1"
+        main_vf = f"scale=1920:1080:flags=bicubic,format=yuv420p,fps={fps},setsar=1"
+        audio_fmt = f"aresample={sr},aformat=channel_layouts=stereo"
+
+        inputs = []
+
+        def add_still(image, duration):
+            inputs.extend(['-loop', '1', '-framerate', str(fps), '-t', f"{duration:.3f}", '-i', image])
+            if has_audio:
+                inputs.extend(['-f', 'lavfi', '-t', f"{duration:.3f}", '-i', f"anullsrc=r={sr}:cl=stereo"])
 
-        concat_inputs = []
+        shape = ()
         if self.start_image:
-            concat_inputs.append('[s]')
-        concat_inputs.append('[mv]')
+            add_still(self.start_image, self.start_duration)
+            shape += ('S',)
+        inputs.extend(['-i', self.video_file])
+        shape += ('M',)
         if self.end_image:
-            concat_inputs.append('[e]')
-        concat_str = ''.join(concat_inputs) + f"concat=n={len(concat_inputs)}:v=1:a=0[v]"
-        filter_complex = ','.join(filters) + ';' + concat_str if filters else concat_str
+            add_still(self.end_image, self.end_duration)
+            shape += ('E',)
+
+        graph = _FILTER_GRAPHS[(shape, has_audio)].format(
+            still_vf=still_vf, main_vf=main_vf, audio_fmt=audio_fmt)
 
         cmd = [self.env.ffmpeg_path, '-hide_banner', '-y'] + inputs + [
-            '-filter_complex', filter_complex,
-            '-map', '[v]', '-map', '0:a?',
-            '-r', str(fps),
+            '-filter_complex', graph,
+            '-map', '[v]',
+        ]
+        if has_audio:
+            cmd += ['-map', '[a]']
+        cmd += ['-colorspace', 'bt709', '-color_primaries', 'bt709', '-color_trc', 'bt709']
+
+        tail = []
+        if has_audio:
+            tail += ['-c:a', 'aac', '-b:a', '192k', '-ar', str(sr), '-ac', '2']
+        if codec == 'hevc':
+            tail += ['-tag:v', 'hvc1']
+        tail += self._thread_args() + ['-movflags', '+faststart', output_path]
+
+        # 與圖片段相同：只在偵測到對應 VideoToolbox 編碼器時使用硬體，否則直接用 libx264
+        # （codec 為 hevc 時呼叫端已確認 hevc_videotoolbox 可用）
+        encoder = f"{codec}_videotoolbox"
+        if not (self.use_hardware and encoder in self.env.hardware_encoders):
+            encoder = 'libx264'
+        total = (main_info.duration or 0.0) + (self.start_duration if self.start_image else 0.0) + (self.end_duration if self.end_image else 0.0)
+        with _encoder_slot(encoder):
+            return self._run_cmd(cmd + self._fallback_video_args(encoder, gop) + tail, total, progress_span)
+
+    def _transcode_main_to_ts(self, main_info: ProbeResult, fps, codec, progress_span=None):
+        out_path = os.path.join(self._tmp_dir, f"main_{uuid.uuid4().hex}.ts")
+        gop = max(2, int(round(fps * 2)))
+        cmd = [
+            self.env.ffmpeg_path, '-hide_banner', '-y',
+            '-i', self.video_file,
+            '-vf', f"scale=1920:1080:flags=bicubic,format=yuv420p,fps={fps}",
             '-colorspace', 'bt709', '-color_primaries', 'bt709', '-color_trc', 'bt709',
         ]
+        if main_info.has_audio:
+            tail = ['-c:a', 'aac', '-b:a', '192k', '-ar', str(main_info.audio_sample_rate or 48000), '-ac', '2']
+        else:
+            tail = ['-an']
+        tail += self._thread_args() + ['-f', 'mpegts', out_path]
 
-        if self.use_hardware and ('h264_videotoolbox' in self.env.hardware_encoders):
-            cmd += ['-c:v', 'h264_videotoolbox', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-sc_threshold', '0', '-b:v', '8M', '-maxrate', '10M', '-bufsize', '20M']
+        # macOS 上一律先試 VideoToolbox（HEVC 主片在支援時維持 HEVC），失敗才回退 libx264
+        encoders = []
+        if codec == 'hevc':
+            encoders.append('hevc_videotoolbox')
         else:
-            cmd += ['-c:v', 'libx264', '-preset', 'medium', '-crf', '19', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-sc_threshold', '0']
+            if self.use_hardware and sys.platform == 'darwin':
+                encoders.append('h264_videotoolbox')
+            encoders.append('libx264')
 
-        if main_info.has_audio:
-            cmd += ['-c:a', 'aac', '-b:a', '192k', '-ar', str(main_info.audio_sample_rate or 48000), '-ac', '2']
+        for encoder in encoders:
+            if self.is_cancelled:
+                return None
+            with _encoder_slot(encoder):
+                if self._run_cmd(cmd + self._fallback_video_args(encoder, gop) + tail, main_info.duration, progress_span):
+                    return out_path
+        return None
 
-        cmd += ['-movflags', '+faststart', output_path]
-        return self._run_cmd(cmd)
+    @staticmethod
+    def _fallback_video_args(encoder, gop):
+        # VideoToolbox 以 -q:v 固定品質模式讓 ASIC 自行調配位元率，並禁止退回軟體編碼
+        if encoder == 'hevc_videotoolbox':
+            return ['-c:v', 'hevc_videotoolbox', '-profile:v', 'main', '-g', str(gop), '-q:v', '55', '-allow_sw', '0', '-realtime', '0']
+        if encoder == 'h264_videotoolbox':
+            return ['-c:v', 'h264_videotoolbox', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-q:v', '55', '-allow_sw', '0', '-realtime', '0']
+        return ['-c:v', 'libx264', '-preset', 'medium', '-crf', '19', '-profile:v', 'high', '-level:v', '4.1', '-g', str(gop), '-sc_threshold', '0']
 
     def run(self):
-        self._tmp_dir = tempfile.mkdtemp(prefix=f"vw2_{self.job_id}_")
-        intro_ts = None
-        outro_ts = None
+        if self.scratch_dir:
+            self._tmp_dir = self.scratch_dir
+        else:
+            self._tmp_dir = tempfile.mkdtemp(prefix=f"vw2_{self.job_id}_")
         main_ts = None
 
         try:
@@ -833,31 +1494,58 @@ class FFmpegWrapperProcessor(QThread):
 
             self.status.emit(self.job_id, "探測主片參數...")
             self.progress.emit(self.job_id, 5)
-            info = probe_main_video(self.env.ffprobe_path, self.video_file)
+            info = self.probe_info
+            if info is None or info.video_codec is None:
+                info = probe_main_video_cached(self.env.ffprobe_path, self.video_file)
             fps = int(round(info.fps)) if info.fps and info.fps > 0 else 30
+            total_duration = (info.duration or 0.0) + (self.start_duration if self.start_image else 0.0) + (self.end_duration if self.end_image else 0.0)
 
-            if self.prefer_copy_concat:
-                self.status.emit(self.job_id, "建立主片 TS...")
-                self.progress.emit(self.job_id, 15)
-                main_ts = self._mux_main_to_ts()
-                if not main_ts:
-                    raise RuntimeError('主片轉 TS 失敗')
-
-                if self.start_image:
-                    if self.is_cancelled: return
-                    self.status.emit(self.job_id, "編碼開頭圖片段...")
-                    self.progress.emit(self.job_id, 35)
-                    intro_ts = self._encode_image_ts(self.start_image, self.start_duration, fps, info.has_audio, info.audio_sample_rate, info.audio_channels)
-                    if not intro_ts:
-                        raise RuntimeError('開頭段編碼失敗')
+            # HEVC 主片需有 hevc_videotoolbox 編出同編碼的圖片段，否則直接走重編碼
+            codec = 'hevc' if info.video_codec == 'hevc' else 'h264'
+            copy_route = self.prefer_copy_concat and (
+                codec == 'h264' or (self.use_hardware and 'hevc_videotoolbox' in self.env.hardware_encoders)
+            )
 
-                if self.end_image:
-                    if self.is_cancelled: return
-                    self.status.emit(self.job_id, "編碼結尾圖片段...")
-                    self.progress.emit(self.job_id, 55)
-                    outro_ts = self._encode_image_ts(self.end_image, self.end_duration, fps, info.has_audio, info.audio_sample_rate, info.audio_channels)
-                    if not outro_ts:
-                        raise RuntimeError('結尾段編碼失敗')
+            if copy_route:
+                # 主片轉封與開頭/結尾圖片段彼此獨立，平行執行；進度以耗時最長的主片為準
+                self.status.emit(self.job_id, "建立主片 TS 並編碼圖片段...")
+                self.progress.emit(self.job_id, 15)
+                tasks = {'main': (lambda: self._mux_main_to_ts(info.duration, (15, 80), codec), '主片轉 TS 失敗')}
+                bumper_keys = []
+                for image, duration, error_msg in (
+                    (self.start_image, self.start_duration, '開頭段編碼失敗'),
+                    (self.end_image, self.end_duration, '結尾段編碼失敗'),
+                ):
+                    # 圖片與秒數相同的段落只編碼一次
+                    key = (image, duration) if image else None
+                    bumper_keys.append(key)
+                    if key and key not in tasks:
+                        tasks[key] = (
+                            lambda image=image, duration=duration: self._encode_image_ts(
+                                image, duration, fps, info.has_audio, info.audio_sample_rate, info.audio_channels, None, codec),
+                            error_msg,
+                        )
+
+                results = {}
+                failed = None
+                with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+                    futures = {pool.submit(fn): key for key, (fn, _) in tasks.items()}
+                    for future in as_completed(futures):
+                        key = futures[future]
+                        results[key] = future.result()
+                        if not results[key] and failed is None:
+                            # 任一段失敗即終止其餘仍在執行的 ffmpeg，並以最先失敗的段落回報錯誤
+                            failed = key
+                            for proc in list(self._running_procs):
+                                try:
+                                    proc.kill()
+                                except Exception:
+                                    pass
+                if self.is_cancelled: return
+                if failed is not None:
+                    raise RuntimeError(tasks[failed][1])
+                main_ts = results['main']
+                intro_ts, outro_ts = (results[key] if key else None for key in bumper_keys)
 
                 seq = []
                 if intro_ts: seq.append(intro_ts)
@@ -868,16 +1556,16 @@ class FFmpegWrapperProcessor(QThread):
 
                 self.status.emit(self.job_id, "合併段落為輸出...")
                 self.progress.emit(self.job_id, 80)
-                if not self._concat_ts_to_mp4(seq, self.output_file):
+                if not self._concat_ts_to_mp4(seq, self.output_file, total_duration, (80, 99), codec):
                     if self.is_cancelled: return
                     self.status.emit(self.job_id, "0-copy 合併失敗，回退重編碼...")
-                    ok = self._transcode_fallback(info, self.output_file)
+                    ok = self._transcode_fallback(info, self.output_file, (80, 99))
                     if not ok:
                         raise RuntimeError('回退重編碼失敗')
             else:
                 self.status.emit(self.job_id, "進行重編碼輸出...")
                 self.progress.emit(self.job_id, 20)
-                ok = self._transcode_fallback(info, self.output_file)
+                ok = self._transcode_fallback(info, self.output_file, (20, 99))
                 if not ok:
                     raise RuntimeError('重編碼輸出失敗')
 
@@ -890,91 +1578,115 @@ class FFmpegWrapperProcessor(QThread):
             if not self.is_cancelled:
                 self.error.emit(self.job_id, str(e))
         finally:
+            if self.scratch_dir:
+                # 重用的目錄只清空內容，留給下一個工作
+                self._clear_dir(self._tmp_dir)
+            elif self._tmp_dir:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _clear_dir(path):
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
             try:
-                if self._tmp_dir and os.path.exists(self._tmp_dir):
-                    for name in os.listdir(self._tmp_dir):
-                        try:
-                            os.remove(os.path.join(self._tmp_dir, name))
-                        except Exception:
-                            pass
-                    try:
-                        os.rmdir(self._tmp_dir)
-                    except Exception:
-                        pass
-            except Exception:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.remove(entry.path)
+            except OSError:
                 pass
 
 
-class JobWidget(QFrame):
-    cancel_requested = pyqtSignal(str)
+class VideoProbeThread(QThread):
+    """於背景執行 ffprobe，避免選檔/拖放時凍結主執行緒；結果附帶世代編號供呼叫端丟棄過期結果"""
+    probed = pyqtSignal(int, str, object)  # gen, path, ProbeResult 或 None
 
-    def __init__(self, job_id, job_name):
+    def __init__(self, gen, probe_bin, path):
         super().__init__()
-        self.job_id = job_id
-        self.setFrameStyle(QFrame.Shape.Box)
-        self.setStyleSheet("QFrame { background: #2a2a2a; border: 1px solid #444; border-radius: 4px; margin: 2px; padding: 5px; }")
+        self.gen = gen
+        self.probe_bin = probe_bin
+        self.path = path
 
-        layout = QVBoxLayout(self)
+    def run(self):
+        try:
+            result = probe_main_video_cached(self.probe_bin, self.path)
+        except Exception:
+            result = None
+        self.probed.emit(self.gen, self.path, result)
 
-        header_layout = QHBoxLayout()
-        self.name_label = QLabel(job_name)
-        self.name_label.setFont(QFont("Arial", 11, QFont.Weight.Bold))
-        self.time_label = QLabel(datetime.now().strftime("%H:%M:%S"))
-        self.time_label.setStyleSheet("color: #888; font-size: 10px;")
-        header_layout.addWidget(self.name_label)
-        header_layout.addStretch()
-        header_layout.addWidget(self.time_label)
-        layout.addLayout(header_layout)
-
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setValue(0)
-        self.status_label = QLabel("準備中...")
-        self.status_label.setStyleSheet("color: #ccc; font-size: 10px;")
-        layout.addWidget(self.progress_bar)
-        layout.addWidget(self.status_label)
-
-        button_layout = QHBoxLayout()
-        self.cancel_btn = QPushButton("取消")
-        self.cancel_btn.setStyleSheet("QPushButton { background: #d32f2f; padding: 4px 8px; font-size: 10px; }")
-        self.cancel_btn.clicked.connect(lambda: self.cancel_requested.emit(self.job_id))
-        self.open_btn = QPushButton("開啟位置")
-        self.open_btn.setStyleSheet("QPushButton { background: #388e3c; padding: 4px 8px; font-size: 10px; }")
-        self.open_btn.setEnabled(False)
-        self.open_btn.clicked.connect(self.open_file_location)
-        button_layout.addWidget(self.cancel_btn)
-        button_layout.addWidget(self.open_btn)
-        button_layout.addStretch()
-        layout.addLayout(button_layout)
 
-        self.output_file = None
+class BatchProbeThread(QThread):
+    """於背景平行探測批次的所有主片，避免建立批次時凍結主執行緒"""
+    probed = pyqtSignal(object)  # 路徑 → ProbeResult
 
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
+    def __init__(self, probe_bin, paths):
+        super().__init__()
+        self.probe_bin = probe_bin
+        self.paths = paths
 
-    def update_status(self, status):
-        self.status_label.setText(status)
+    def run(self):
+        try:
+            results = dict(zip(self.paths, probe_many(self.probe_bin, self.paths)))
+        except Exception:
+            results = {}
+        self.probed.emit(results)
+
+
+def grab_first_frame(ffmpeg_bin, probe_bin, path, width=350, height=200) -> QImage:
+    """以 ffmpeg 將首幀以 rgb24 原始資料輸出到 stdout，包成 QImage 後縮放為預覽圖（可於背景執行緒呼叫）"""
+    pr = probe_main_video_cached(probe_bin, path)
+    if not pr.width or not pr.height:
+        return QImage()
+    w, h = pr.width, pr.height
+    p = subprocess.run([ffmpeg_bin, '-v', 'error', '-noautorotate', '-ss', '0', '-i', path,
+                        '-frames:v', '1', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'],
+                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, **_SPAWN_KWARGS)
+    buf = p.stdout
+    if len(buf) != w * h * 3:
+        return QImage()
+    # QImage 直接引用 buf（不複製），scaled() 產生獨立的縮圖，只複製縮圖大小的資料
+    frame = QImage(buf, w, h, w * 3, QImage.Format.Format_RGB888)
+    return frame.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class PreviewFrameThread(QThread):
+    """於背景擷取影片首幀；QPixmap 只能在主執行緒建立，因此回傳已縮放的 QImage"""
+    grabbed = pyqtSignal(int, object, object)  # gen, 快取鍵, QImage
+
+    def __init__(self, gen, key, ffmpeg_bin, probe_bin, path):
+        super().__init__()
+        self.gen = gen
+        self.key = key
+        self.ffmpeg_bin = ffmpeg_bin
+        self.probe_bin = probe_bin
+        self.path = path
+
+    def run(self):
+        try:
+            image = grab_first_frame(self.ffmpeg_bin, self.probe_bin, self.path)
+        except Exception:
+            image = QImage()
+        self.grabbed.emit(self.gen, self.key, image)
 
-    def set_finished(self, output_file):
-        self.output_file = output_file
-        self.cancel_btn.setEnabled(False)
-        self.open_btn.setEnabled(True)
-        self.progress_bar.setValue(100)
-        self.status_label.setText("✅ 完成")
-        self.status_label.setStyleSheet("color: #4caf50; font-size: 10px;")
 
-    def set_error(self, error_msg):
-        self.cancel_btn.setEnabled(False)
-        self.status_label.setText(f"❌ 錯誤: {error_msg}")
-        self.status_label.setStyleSheet("color: #f44336; font-size: 10px;")
+def reveal_in_finder(path):
+    """在 Finder 中選取檔案"""
+    if NSWorkspace is not None:
+        NSWorkspace.sharedWorkspace().selectFile_inFileViewerRootedAtPath_(path, '')
+    else:
+        subprocess.run(["open", "-R", path])
 
-    def set_cancelled(self):
-        self.cancel_btn.setEnabled(False)
-        self.status_label.setText("🚫 已取消")
-        self.status_label.setStyleSheet("color: #ff9800; font-size: 10px;")
 
-    def open_file_location(self):
-        if self.output_file and os.path.exists(self.output_file):
-            subprocess.run(["open", "-R", self.output_file])
+def open_with_default_app(path):
+    """以預設應用程式開啟檔案"""
+    if NSWorkspace is not None:
+        NSWorkspace.sharedWorkspace().openFile_(path)
+    else:
+        subprocess.run(["open", path])
 
 
 class JobItem:
@@ -986,12 +1698,20 @@ class JobItem:
         self.state = "queued"  # queued|running|done|error|cancel
         self.output_file = None
         self.started_at = datetime.now()
+        # (寬度, 名稱, 省略後文字)；名稱或寬度變動即失效
+        self._elided_cache = None
 
 
 class JobListModel(QAbstractListModel):
+    # 進度更新合併到每 16ms（約 60Hz）一次 dataChanged，避免逐次重繪
+    PROGRESS_FLUSH_MS = 16
+
     def __init__(self):
         super().__init__()
         self.items: list[JobItem] = []
+        self._id_to_row: dict[str, int] = {}
+        self._pending_ids: set[str] = set()
+        self._flush_armed = False
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self.items)
@@ -1010,13 +1730,28 @@ class JobListModel(QAbstractListModel):
     def add_item(self, item: JobItem):
         self.beginInsertRows(QModelIndex(), len(self.items), len(self.items))
         self.items.append(item)
+        self._id_to_row[item.job_id] = len(self.items) - 1
         self.endInsertRows()
 
+    def add_items(self, items: list[JobItem]):
+        """一次插入多列，只觸發一次版面更新"""
+        if not items:
+            return
+        first = len(self.items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self.items.extend(items)
+        for i, it in enumerate(items, first):
+            self._id_to_row[it.job_id] = i
+        self.endInsertRows()
+
+    def replace_items(self, items: list[JobItem]):
+        self.beginResetModel()
+        self.items = items
+        self._id_to_row = {it.job_id: i for i, it in enumerate(items)}
+        self.endResetModel()
+
     def find_row_by_id(self, job_id: str) -> int:
-        for i, it in enumerate(self.items):
-            if it.job_id == job_id:
-                return i
-        return -1
+        return self._id_to_row.get(job_id, -1)
 
     def update_progress(self, job_id: str, progress: int, status: str | None = None):
         row = self.find_row_by_id(job_id)
@@ -1028,8 +1763,23 @@ class JobListModel(QAbstractListModel):
             item.status_text = status
         if progress >= 100:
             item.state = "done"
-        top_left = self.index(row, 0)
-        self.dataChanged.emit(top_left, top_left)
+        self._pending_ids.add(job_id)
+        if not self._flush_armed:
+            self._flush_armed = True
+            QTimer.singleShot(self.PROGRESS_FLUSH_MS, self._flush_pending)
+
+    def _flush_pending(self):
+        self._flush_armed = False
+        rows = sorted(r for r in map(self._id_to_row.get, self._pending_ids) if r is not None)
+        self._pending_ids.clear()
+        # 連續的列合併為一次 dataChanged
+        i = 0
+        while i < len(rows):
+            j = i
+            while j + 1 < len(rows) and rows[j + 1] == rows[j] + 1:
+                j += 1
+            self.dataChanged.emit(self.index(rows[i], 0), self.index(rows[j], 0))
+            i = j + 1
 
     def set_state(self, job_id: str, state: str, status: str | None = None, output_file: str | None = None):
         row = self.find_row_by_id(job_id)
@@ -1048,12 +1798,52 @@ class JobListModel(QAbstractListModel):
         if row < 0 or row >= len(self.items):
             return
         self.beginRemoveRows(QModelIndex(), row, row)
-        del self.items[row]
+        removed = self.items.pop(row)
+        self._id_to_row.pop(removed.job_id, None)
+        for i in range(row, len(self.items)):
+            self._id_to_row[self.items[i].job_id] = i
         self.endRemoveRows()
 
 
 class JobItemDelegate(QStyledItemDelegate):
     ROW_HEIGHT = 56
+    _DOT_MAP = {
+        "queued": QColor(120,120,120),
+        "running": QColor(33,150,243),
+        "done": QColor(76,175,80),
+        "error": QColor(244,67,54),
+        "cancel": QColor(255,152,0),
+    }
+    _BG = QColor(42, 42, 42)
+    _BG_HOVER = QColor(48, 48, 48)
+    _TRACK = QColor(60,60,60)
+    _CHUNK_MAP = {
+        "done": QColor(76,175,80),
+        "error": QColor(244,67,54),
+        "cancel": QColor(255,152,0),
+    }
+    _CHUNK_DEFAULT = QColor(0,120,212)
+    DOT_R = 6
+    DOT_CX = 12
+    TEXT_LEFT = DOT_CX + 10 + DOT_R
+    RIGHT_PADDING = 8
+    BAR_H = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._name_pen = QPen(QColor(240,240,240))
+        self._sub_pen = QPen(QColor(170,170,170))
+        self._dot_brushes = {k: QBrush(c) for k, c in self._DOT_MAP.items()}
+        self._small_font = None  # 首次繪製時依畫面字型建立
+
+    def _elided_name(self, item: "JobItem", fm: QFontMetrics, width: int) -> str:
+        cached = item._elided_cache
+        if cached is not None and cached[0] == width and cached[1] == item.name:
+            return cached[2]
+        text = fm.elidedText(item.name, Qt.TextElideMode.ElideMiddle, width)
+        item._elided_cache = (width, item.name, text)
+        return text
+
     def sizeHint(self, option, index):
         return QSize(option.rect.width(), self.ROW_HEIGHT)
 
@@ -1066,59 +1856,45 @@ class JobItemDelegate(QStyledItemDelegate):
         painter.save()
 
         # 背景
-        bg = QColor(42, 42, 42)
         if option.state & QStyle.StateFlag.State_MouseOver:
-            bg = QColor(48, 48, 48)
-        painter.fillRect(rect, bg)
+            painter.fillRect(rect, self._BG_HOVER)
+        else:
+            painter.fillRect(rect, self._BG)
+
+        rx, ry, rw, rh = rect.x(), rect.y(), rect.width(), rect.height()
+        dot_r = self.DOT_R
 
         # 左側狀態點
-        dot_map = {
-            "queued": QColor(120,120,120),
-            "running": QColor(33,150,243),
-            "done": QColor(76,175,80),
-            "error": QColor(244,67,54),
-            "cancel": QColor(255,152,0),
-        }
-        dot_color = dot_map.get(item.state, QColor(120,120,120))
-        dot_r = 6
-        cx = rect.left() + 12
-        cy = rect.top() + rect.height()//2
-        painter.setBrush(QBrush(dot_color))
+        cx = rx + self.DOT_CX
+        cy = ry + rh//2
+        painter.setBrush(self._dot_brushes.get(item.state, self._dot_brushes["queued"]))
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawEllipse(cx - dot_r, cy - dot_r, dot_r*2, dot_r*2)
 
-        # 文字區域
-        left = cx + 10 + dot_r
-        right_padding = 8
-        text_rect = rect.adjusted(left, 6, -right_padding, -18)
-        sub_rect = rect.adjusted(left, 24, -right_padding, -6)
+        # 文字區域（以整數座標直接繪製，不另建 QRect）
+        x = rx + self.TEXT_LEFT
+        total_w = rw - self.TEXT_LEFT - self.RIGHT_PADDING
 
-        painter.setPen(QPen(QColor(240,240,240)))
-        fm = QFontMetrics(painter.font())
-        name_text = fm.elidedText(item.name, Qt.TextElideMode.ElideMiddle, text_rect.width())
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter, name_text)
+        painter.setPen(self._name_pen)
+        name_text = self._elided_name(item, option.fontMetrics, total_w)
+        painter.drawText(x, ry + 6, total_w, rh - 24, Qt.AlignmentFlag.AlignVCenter, name_text)
 
-        painter.setPen(QPen(QColor(170,170,170)))
-        painter.setFont(QFont(painter.font().family(), 10))
-        painter.drawText(sub_rect, Qt.AlignmentFlag.AlignVCenter,
+        if self._small_font is None:
+            self._small_font = QFont(painter.font().family(), 10)
+        painter.setPen(self._sub_pen)
+        painter.setFont(self._small_font)
+        painter.drawText(x, ry + 24, total_w, rh - 30, Qt.AlignmentFlag.AlignVCenter,
                          f"{item.status_text}  •  {item.progress}%")
 
         # 進度條（底部極細）
-        bar_h = 3
-        bar_rect = rect.adjusted(left, rect.height()-bar_h-4, -right_padding, -4)
-        track = QColor(60,60,60)
-        painter.fillRect(bar_rect, track)
+        bar_h = self.BAR_H
+        y = ry + rh - bar_h - 4
+        painter.fillRect(x, y, total_w, bar_h, self._TRACK)
         if item.progress > 0:
-            if item.state == "done":
-                chunk = QColor(76,175,80)
-            elif item.state == "error":
-                chunk = QColor(244,67,54)
-            elif item.state == "cancel":
-                chunk = QColor(255,152,0)
-            else:
-                chunk = QColor(0,120,212)
-            w = max(0, int(bar_rect.width() * max(0, min(item.progress, 100)) / 100))
-            painter.fillRect(bar_rect.adjusted(0,0, -(bar_rect.width()-w), 0), chunk)
+            chunk = self._CHUNK_MAP.get(item.state, self._CHUNK_DEFAULT)
+            w = total_w * max(0, min(item.progress, 100)) // 100
+            if w > 0:
+                painter.fillRect(x, y, w, bar_h, chunk)
 
         painter.restore()
 
@@ -1170,6 +1946,9 @@ class DropZone(QFrame):
 
 
 class VideoEditorFFApp(QMainWindow):
+    PIX_CACHE_LIMIT_KB = 64 * 1024
+    UI_REFRESH_DEBOUNCE_MS = 100
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("影片編輯器 - FFmpeg 直呼版（單次/批次模式）")
@@ -1188,6 +1967,25 @@ class VideoEditorFFApp(QMainWindow):
         self.video_file = None
         self.start_image_file = None
         self.end_image_file = None
+        # 預覽縮圖交給 Qt 全域 QPixmapCache（LRU，依總容量淘汰）
+        QPixmapCache.setCacheLimit(self.PIX_CACHE_LIMIT_KB)
+        self._preview_gen = 0
+        self._preview_threads = set()
+        self._ffmpeg_status_cache = None
+        self._file_dialogs = {}
+        self._job_scratch: dict[str, str] = {}  # 批次 job_id → 借用的暫存目錄
+
+        # 拖放後的資訊/按鈕狀態刷新去抖動
+        self._ui_refresh_timer = QTimer(self)
+        self._ui_refresh_timer.setSingleShot(True)
+        self._ui_refresh_timer.setInterval(self.UI_REFRESH_DEBOUNCE_MS)
+        self._ui_refresh_timer.timeout.connect(self._do_ui_refresh)
+        # 背景探測：_probe_gen 遞增以丟棄過期結果；_probed 為 (路徑, stat 簽章, 結果)，
+        # _probe_inflight 為進行中的 (路徑, stat 簽章)，避免重複啟動
+        self._probe_gen = 0
+        self._probed = None
+        self._probe_inflight = None
+        self._probe_threads = set()
 
         self.prefer_copy_concat = True
         self.use_hardware = True
@@ -1196,7 +1994,9 @@ class VideoEditorFFApp(QMainWindow):
         self.active_processors = {}
         self.job_widgets = {}
         self.job_queue = []
-        self.MAX_CONCURRENT_JOBS = 1
+        self.MAX_CONCURRENT_JOBS = self._compute_concurrency()
+        # 使用者手動選過同時處理數後，切換硬體加速不再覆寫
+        self._concurrency_user_set = False
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -1257,6 +2057,8 @@ class VideoEditorFFApp(QMainWindow):
         # 批次設定面板
         self.batch_settings = BatchSettingsPanel(self.file_matcher)
         self.batch_settings.scan_btn.clicked.connect(self.on_batch_scan)
+        self.batch_settings.concurrency_combo.setCurrentIndex(self.MAX_CONCURRENT_JOBS - 1)
+        self.batch_settings.concurrency_combo.currentIndexChanged.connect(self.on_concurrency_changed)
         left_layout.addWidget(self.batch_settings)
         
         # 批次預覽
@@ -1268,8 +2070,6 @@ class VideoEditorFFApp(QMainWindow):
         self.batch_process_btn.setObjectName("PrimaryCTA")
         self.batch_process_btn.setEnabled(False)
         self.batch_process_btn.clicked.connect(self.start_batch_processing)
-        # 直接設定樣式
-        self.apply_primary_button_style(self.batch_process_btn)
         left_layout.addWidget(self.batch_process_btn)
         
         self.batch_splitter.addWidget(left_widget)
@@ -1293,9 +2093,9 @@ class VideoEditorFFApp(QMainWindow):
         title = QLabel("批次處理工作列表")
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         self.batch_active_count_label = QLabel("進行中: 0")
-        self.batch_active_count_label.setStyleSheet("color: #4caf50; font-size: 12px;")
+        self.batch_active_count_label.setObjectName("StatusGreen")
         self.batch_pending_count_label = QLabel("佇列中: 0")
-        self.batch_pending_count_label.setStyleSheet("color: #ff9800; font-size: 12px;")
+        self.batch_pending_count_label.setObjectName("StatusOrange")
         header_layout.addWidget(title)
         header_layout.addStretch()
         header_layout.addWidget(self.batch_active_count_label)
@@ -1327,49 +2127,57 @@ class VideoEditorFFApp(QMainWindow):
             QLabel { color: #f0f0f0; font-size: 15px; font-weight: 500; }
             /* 功能區分組樣式 */
             QWidget#FunctionGroup { background: #2a2a2a; border: 1px solid #3a3a3a; border-radius: 8px; margin: 4px; padding: 8px; }
+            QWidget#ControlBar { background: #2a2a2a; border: 1px solid #3a3a3a; border-radius: 8px; padding: 8px; }
             QLabel#SectionTitle { color: #4fc3f7; font-size: 14px; font-weight: 600; margin-bottom: 4px; }
+            /* 狀態與檔名標籤 */
+            QLabel#StatusGreen { color: #4caf50; font-size: 12px; }
+            QLabel#StatusOrange { color: #ff9800; font-size: 12px; }
+            QLabel#ProgressHint { color: #ff9800; font-size: 13px; }
+            QLabel#FileLabel { color: #888; font-size: 13px; font-style: italic; }
+            QLabel#PathMono { color: #888; font-size: 10px; font-family: monospace; }
+            QLabel#PreviewPane { background: #111; border: 1px solid #444; }
             /* 按鈕：緊湊但清晰 */
             QPushButton { background: #007acc; color: #fff; border: 1px solid #444; border-radius: 5px; padding: 8px 10px; font-size: 14px; }
             QPushButton:disabled { background: #444; color: #888; }
             QPushButton:hover { background: #0099ff; }
-            /* 主要操作按鈕 - 綠色系 - 強制優先級 */
-            QPushButton#PrimaryCTA { 
-                background-color: #4caf50 !important; 
-                color: #ffffff !important;
-                font-size: 16px !important; 
-                font-weight: 700 !important; 
-                height: 40px !important; 
-                border: 2px solid #66bb6a !important; 
-                border-radius: 6px !important;
-                padding: 8px 16px !important;
+            /* 主要操作按鈕 - 綠色系 */
+            QPushButton#PrimaryCTA {
+                background-color: #4caf50;
+                color: #ffffff;
+                font-size: 16px;
+                font-weight: 700;
+                height: 40px;
+                border: 2px solid #66bb6a;
+                border-radius: 6px;
+                padding: 8px 16px;
             }
-            QPushButton#PrimaryCTA:hover { 
-                background-color: #66bb6a !important; 
-                border: 2px solid #81c784 !important; 
+            QPushButton#PrimaryCTA:hover {
+                background-color: #66bb6a;
+                border: 2px solid #81c784;
             }
-            QPushButton#PrimaryCTA:disabled { 
-                background-color: #424242 !important; 
-                color: #757575 !important; 
-                border: 2px dashed #616161 !important; 
+            QPushButton#PrimaryCTA:disabled {
+                background-color: #424242;
+                color: #757575;
+                border: 2px dashed #616161;
             }
-            /* 次要操作按鈕 - 灰色系 - 強制優先級 */
-            QPushButton#SecondaryBtn { 
-                background-color: #757575 !important; 
-                color: #ffffff !important;
-                border: 1px solid #9e9e9e !important; 
-                border-radius: 5px !important;
-                font-size: 14px !important;
-                padding: 8px 12px !important;
+            /* 次要操作按鈕 - 灰色系 */
+            QPushButton#SecondaryBtn {
+                background-color: #757575;
+                color: #ffffff;
+                border: 1px solid #9e9e9e;
+                border-radius: 5px;
+                font-size: 14px;
+                padding: 8px 12px;
             }
-            QPushButton#SecondaryBtn:hover { 
-                background-color: #9e9e9e !important; 
-                border: 1px solid #bdbdbd !important; 
+            QPushButton#SecondaryBtn:hover {
+                background-color: #9e9e9e;
+                border: 1px solid #bdbdbd;
             }
             /* 進度條 */
             QProgressBar { background: #2c2c2c; border: 1px solid #444; border-radius: 5px; text-align: center; color: #fff; min-height: 10px; }
             QProgressBar::chunk { background: #0078d4; }
-            /* 文本區緊湊 */
-            QTextEdit { background: #232323; color: #d0d0d0; border: 1px solid #444; border-radius: 5px; font-size: 13px; padding: 4px; }
+            /* 檔案資訊（唯讀文字） */
+            QLabel#InfoText { background: #232323; color: #d0d0d0; border: 1px solid #444; border-radius: 5px; font-size: 13px; padding: 4px; }
             /* 數字輸入緊湊 */
             QDoubleSpinBox { background: #232323; color: #fff; border: 1px solid #444; border-radius: 5px; padding: 4px; font-size: 14px; }
             /* 複選框 */
@@ -1417,7 +2225,7 @@ class VideoEditorFFApp(QMainWindow):
         # 預覽區（可選，底部）
         self.chk_show_preview = QCheckBox("顯示預覽")
         self.chk_show_preview.setChecked(False)
-        self.chk_show_preview.stateChanged.connect(lambda _: self.toggle_preview_group())
+        self.chk_show_preview.stateChanged.connect(self.toggle_preview_group)
         left_layout.addWidget(self.chk_show_preview)
         
         self.preview_group = self.create_preview_group()
@@ -1440,9 +2248,9 @@ class VideoEditorFFApp(QMainWindow):
         title = QLabel("處理工作列表")
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         self.active_count_label = QLabel("進行中: 0")
-        self.active_count_label.setStyleSheet("color: #4caf50; font-size: 12px;")
+        self.active_count_label.setObjectName("StatusGreen")
         self.pending_count_label = QLabel("佇列中: 0")
-        self.pending_count_label.setStyleSheet("color: #ff9800; font-size: 12px;")
+        self.pending_count_label.setObjectName("StatusOrange")
         header_layout.addWidget(title)
         header_layout.addStretch()
         header_layout.addWidget(self.active_count_label)
@@ -1488,7 +2296,7 @@ class VideoEditorFFApp(QMainWindow):
         self.video_btn = QPushButton("選擇影片")
         self.video_btn.clicked.connect(self.select_video_file)
         self.video_label = QLabel("請選擇主要影片檔案")
-        self.video_label.setStyleSheet("color: #888; font-size: 13px; font-style: italic;")
+        self.video_label.setObjectName("FileLabel")
         video_layout.addWidget(self.video_btn)
         video_layout.addWidget(self.video_label)
         vbox.addWidget(video_group)
@@ -1518,7 +2326,7 @@ class VideoEditorFFApp(QMainWindow):
         self.start_btn = QPushButton("選擇開頭圖片")
         self.start_btn.clicked.connect(self.select_start_image)
         self.start_label = QLabel("尚未選擇開頭圖片")
-        self.start_label.setStyleSheet("color: #888; font-size: 13px; font-style: italic;")
+        self.start_label.setObjectName("FileLabel")
         image_layout.addWidget(self.start_btn)
         image_layout.addWidget(self.start_label)
 
@@ -1542,7 +2350,7 @@ class VideoEditorFFApp(QMainWindow):
         self.end_btn = QPushButton("選擇結尾圖片")
         self.end_btn.clicked.connect(self.select_end_image)
         self.end_label = QLabel("尚未選擇結尾圖片")
-        self.end_label.setStyleSheet("color: #888; font-size: 13px; font-style: italic;")
+        self.end_label.setObjectName("FileLabel")
         image_layout.addWidget(self.end_btn)
         image_layout.addWidget(self.end_label)
         
@@ -1568,17 +2376,17 @@ class VideoEditorFFApp(QMainWindow):
         
         self.chk_prefer_copy = QCheckBox("🚀 免重編碼優先")
         self.chk_prefer_copy.setChecked(True)
-        self.chk_prefer_copy.stateChanged.connect(lambda _: self.on_options_changed())
+        self.chk_prefer_copy.stateChanged.connect(self.on_options_changed)
         options_layout.addWidget(self.chk_prefer_copy)
 
         self.chk_use_hw = QCheckBox("⚡ 硬體加速編碼")
         self.chk_use_hw.setChecked(True)
-        self.chk_use_hw.stateChanged.connect(lambda _: self.on_options_changed())
+        self.chk_use_hw.stateChanged.connect(self.on_options_changed)
         options_layout.addWidget(self.chk_use_hw)
 
         self.auto_output_checkbox = QCheckBox("📁 自動輸出到來源資料夾")
         self.auto_output_checkbox.setChecked(True)
-        self.auto_output_checkbox.stateChanged.connect(lambda _: setattr(self, 'auto_output_to_source', self.auto_output_checkbox.isChecked()))
+        self.auto_output_checkbox.stateChanged.connect(self._on_auto_output_changed)
         options_layout.addWidget(self.auto_output_checkbox)
         
         vbox.addWidget(options_group)
@@ -1595,17 +2403,17 @@ class VideoEditorFFApp(QMainWindow):
         
         # FFmpeg 狀態
         self.ffmpeg_status_label = QLabel("FFmpeg: 檢查中...")
-        self.ffmpeg_status_label.setStyleSheet("color: #ff9800; font-size: 12px;")
+        self.ffmpeg_status_label.setObjectName("StatusOrange")
         ffmpeg_layout.addWidget(self.ffmpeg_status_label)
         
         # FFprobe 狀態
         self.ffprobe_status_label = QLabel("FFprobe: 檢查中...")
-        self.ffprobe_status_label.setStyleSheet("color: #ff9800; font-size: 12px;")
+        self.ffprobe_status_label.setObjectName("StatusOrange")
         ffmpeg_layout.addWidget(self.ffprobe_status_label)
         
         # 路徑信息
         self.ffmpeg_path_label = QLabel("路徑: 載入中...")
-        self.ffmpeg_path_label.setStyleSheet("color: #888; font-size: 10px; font-family: monospace;")
+        self.ffmpeg_path_label.setObjectName("PathMono")
         self.ffmpeg_path_label.setWordWrap(True)
         ffmpeg_layout.addWidget(self.ffmpeg_path_label)
         
@@ -1623,13 +2431,16 @@ class VideoEditorFFApp(QMainWindow):
         
         # 選擇進度
         self.progress_label = QLabel("📋 請選擇檔案以開始")
-        self.progress_label.setStyleSheet("color: #ff9800; font-size: 13px;")
+        self.progress_label.setObjectName("ProgressHint")
         info_layout.addWidget(self.progress_label)
         
-        self.info_text = QTextEdit()
-        self.info_text.setReadOnly(True)
-        self.info_text.setText("檔案資訊將顯示在此處...")
-        self.info_text.setMaximumHeight(60)
+        # 僅顯示數行文字，用 QLabel 即可，不需 QTextEdit 的整套文件排版
+        self.info_text = QLabel("檔案資訊將顯示在此處...")
+        self.info_text.setObjectName("InfoText")
+        self.info_text.setWordWrap(True)
+        self.info_text.setTextFormat(Qt.TextFormat.PlainText)
+        self.info_text.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.info_text.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
         info_layout.addWidget(self.info_text)
         
         vbox.addWidget(info_group)
@@ -1643,7 +2454,7 @@ class VideoEditorFFApp(QMainWindow):
         self.preview_label = QLabel("請選擇檔案進行預覽")
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.preview_label.setFixedSize(350, 200)
-        self.preview_label.setStyleSheet("background: #111; border: 1px solid #444;")
+        self.preview_label.setObjectName("PreviewPane")
         vbox.addWidget(self.preview_label)
 
         btn_layout = QHBoxLayout()
@@ -1657,12 +2468,6 @@ class VideoEditorFFApp(QMainWindow):
         btn_layout.addWidget(btn_preview_video)
         btn_layout.addWidget(btn_preview_end)
         vbox.addLayout(btn_layout)
-
-        self.info_text = QTextEdit()
-        self.info_text.setReadOnly(True)
-        self.info_text.setText("檔案資訊將顯示在此處...")
-        self.info_text.setMaximumHeight(120)
-        vbox.addWidget(self.info_text)
         group.setLayout(vbox)
         return group
 
@@ -1670,14 +2475,7 @@ class VideoEditorFFApp(QMainWindow):
         """主按鈕區"""
         # 按鈕容器
         btn_container = QWidget()
-        btn_container.setStyleSheet("""
-            QWidget { 
-                background: #2a2a2a; 
-                border: 1px solid #3a3a3a; 
-                border-radius: 8px; 
-                padding: 8px; 
-            }
-        """)
+        btn_container.setObjectName("ControlBar")
         hbox = QHBoxLayout(btn_container)
         hbox.setSpacing(12)
         
@@ -1687,8 +2485,6 @@ class VideoEditorFFApp(QMainWindow):
         self.process_btn.setEnabled(False)
         self.process_btn.setToolTip("請先選擇影片和圖片檔案")
         self.process_btn.clicked.connect(self.add_to_queue)
-        # 直接設定樣式
-        self.apply_primary_button_style(self.process_btn)
         hbox.addWidget(self.process_btn, 3)
         
         # 次要按鈕
@@ -1696,59 +2492,39 @@ class VideoEditorFFApp(QMainWindow):
         self.clear_btn.setObjectName("SecondaryBtn")
         self.clear_btn.setToolTip("清除所有已選擇的檔案")
         self.clear_btn.clicked.connect(self.clear_selection)
-        # 直接設定樣式
-        self.apply_secondary_button_style(self.clear_btn)
         hbox.addWidget(self.clear_btn, 1)
         
         layout.addWidget(btn_container)
 
-    def apply_primary_button_style(self, button):
-        """直接套用主要按鈕樣式"""
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #4caf50;
-                color: #ffffff;
-                font-size: 16px;
-                font-weight: 700;
-                height: 40px;
-                border: 2px solid #66bb6a;
-                border-radius: 6px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #66bb6a;
-                border: 2px solid #81c784;
-            }
-            QPushButton:disabled {
-                background-color: #424242;
-                color: #757575;
-                border: 2px dashed #616161;
-            }
-        """)
-
-    def apply_secondary_button_style(self, button):
-        """直接套用次要按鈕樣式"""
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #757575;
-                color: #ffffff;
-                border: 1px solid #9e9e9e;
-                border-radius: 5px;
-                font-size: 14px;
-                padding: 8px 12px;
-            }
-            QPushButton:hover {
-                background-color: #9e9e9e;
-                border: 1px solid #bdbdbd;
-            }
-        """)
-
-    def on_options_changed(self):
+    def on_options_changed(self, _state=None):
         self.prefer_copy_concat = self.chk_prefer_copy.isChecked()
         self.use_hardware = self.chk_use_hw.isChecked()
+        if not self._concurrency_user_set:
+            # 預設同時處理數取決於是否使用 VideoToolbox，切換後重新計算
+            self.MAX_CONCURRENT_JOBS = self._compute_concurrency()
+            combo = self.batch_settings.concurrency_combo
+            combo.blockSignals(True)
+            combo.setCurrentIndex(self.MAX_CONCURRENT_JOBS - 1)
+            combo.blockSignals(False)
+            self.process_next_in_queue()
+
+    def _on_auto_output_changed(self, _state=None):
+        self.auto_output_to_source = self.auto_output_checkbox.isChecked()
+
+    def _pick_file(self, title, name_filter):
+        """重複使用同一個開檔對話框（依標題區分），免去每次重建並保留上次所在資料夾"""
+        dlg = self._file_dialogs.get(title)
+        if dlg is None:
+            dlg = QFileDialog(self, title, "", name_filter)
+            dlg.setFileMode(QFileDialog.FileMode.ExistingFile)
+            self._file_dialogs[title] = dlg
+        if not dlg.exec():
+            return None
+        files = dlg.selectedFiles()
+        return files[0] if files else None
 
     def select_video_file(self):
-        file, _ = QFileDialog.getOpenFileName(self, "選擇影片檔案", "", "影片檔案 (*.mp4 *.mov *.mkv *.avi)")
+        file = self._pick_file("選擇影片檔案", "影片檔案 (*.mp4 *.mov *.mkv *.avi)")
         if file:
             self.video_file = file
             self.video_label.setText(os.path.basename(file))
@@ -1756,7 +2532,7 @@ class VideoEditorFFApp(QMainWindow):
             self.check_all_files_selected()
 
     def select_start_image(self):
-        file, _ = QFileDialog.getOpenFileName(self, "選擇開頭圖片", "", "圖片檔案 (*.png *.jpg *.jpeg *.bmp *.gif)")
+        file = self._pick_file("選擇開頭圖片", "圖片檔案 (*.png *.jpg *.jpeg *.bmp *.gif)")
         if file:
             self.start_image_file = file
             self.start_label.setText(os.path.basename(file))
@@ -1768,7 +2544,7 @@ class VideoEditorFFApp(QMainWindow):
             self.check_all_files_selected()
 
     def select_end_image(self):
-        file, _ = QFileDialog.getOpenFileName(self, "選擇結尾圖片", "", "圖片檔案 (*.png *.jpg *.jpeg *.bmp *.gif)")
+        file = self._pick_file("選擇結尾圖片", "圖片檔案 (*.png *.jpg *.jpeg *.bmp *.gif)")
         if file:
             self.end_image_file = file
             self.end_label.setText(os.path.basename(file))
@@ -1800,11 +2576,14 @@ class VideoEditorFFApp(QMainWindow):
     def update_info_display(self):
         info = ""
         if self.video_file:
-            try:
-                pr = probe_main_video(self.env.ffprobe_path, self.video_file)
-                info += f"📹 {os.path.basename(self.video_file)}\n{pr.width}x{pr.height} @ {pr.fps:.1f}fps\n{pr.video_codec} / {'有音' if pr.has_audio else '無音'}\n\n"
-            except Exception:
-                info += f"📹 {os.path.basename(self.video_file)}\n無法讀取資訊\n\n"
+            pr = self._peek_video_meta(self.video_file)
+            if pr is self._PROBE_PENDING:
+                info += f"📹 {os.path.basename(self.video_file)}\n讀取中…\n\n"
+            else:
+                try:
+                    info += f"📹 {os.path.basename(self.video_file)}\n{pr.width}x{pr.height} @ {pr.fps:.1f}fps\n{pr.video_codec} / {'有音' if pr.has_audio else '無音'}\n\n"
+                except Exception:
+                    info += f"📹 {os.path.basename(self.video_file)}\n無法讀取資訊\n\n"
         if self.start_image_file:
             info += f"🖼️ 開頭: {os.path.basename(self.start_image_file)} ({self.start_duration.value()}秒)\n"
         if self.end_image_file:
@@ -1816,6 +2595,37 @@ class VideoEditorFFApp(QMainWindow):
             info = "檔案資訊將顯示在此處..."
         self.info_text.setText(info)
     
+    _PROBE_PENDING = object()
+
+    def _peek_video_meta(self, path):
+        """回傳已探測的結果；尚未探測或檔案已變更時於背景啟動探測並回傳 _PROBE_PENDING"""
+        try:
+            st = os.stat(path)
+            sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+        if self._probed and self._probed[0] == path and self._probed[1] == sig:
+            return self._probed[2]
+        if self._probe_inflight == (path, sig):
+            return self._PROBE_PENDING
+        self._probe_inflight = (path, sig)
+        self._probe_gen += 1
+        worker = VideoProbeThread(self._probe_gen, self.env.ffprobe_path, path)
+        worker.probed.connect(lambda gen, p, result, sig=sig: self._on_video_probed(gen, p, sig, result))
+        worker.finished.connect(lambda w=worker: self._probe_threads.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._probe_threads.add(worker)
+        worker.start()
+        return self._PROBE_PENDING
+
+    def _on_video_probed(self, gen, path, sig, result):
+        if gen != self._probe_gen:
+            return  # 已有較新的探測請求
+        self._probe_inflight = None
+        self._probed = (path, sig, result)
+        if path == self.video_file:
+            self.update_info_display()
+
     def update_progress_indicator(self, has_video, has_start, has_end):
         """更新選擇進度指示器"""
         if not hasattr(self, 'progress_label'):
@@ -1838,33 +2648,79 @@ class VideoEditorFFApp(QMainWindow):
         if not self.start_image_file:
             QMessageBox.warning(self, "警告", "請先選擇開頭圖片")
             return
-        img = QPixmap(self.start_image_file)
-        self.preview_label.setPixmap(img.scaled(350, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        self._preview_gen += 1  # 讓尚在背景擷取的影片預覽不覆蓋此圖
+        self.preview_label.setPixmap(self._cached_scaled_pixmap(self.start_image_file))
+
+    def _cached_scaled_pixmap(self, path, loader=None):
+        """取得縮放後的預覽圖，以 (路徑, 修改時間, 尺寸) 為鍵存於 QPixmapCache；loader 需回傳已縮放的 QPixmap"""
+        try:
+            key = self._pix_key(path)
+        except OSError:
+            return QPixmap()  # 檔案已移動或刪除
+        pix = QPixmapCache.find(key)
+        if pix is not None:
+            return pix
+        pix = (loader or self._load_scaled_image)(path)
+        if not pix.isNull():
+            QPixmapCache.insert(key, pix)
+        return pix
+
+    @staticmethod
+    def _pix_key(path):
+        return f"{path}|{os.stat(path).st_mtime_ns}|350x200"
+
+    def _load_scaled_image(self, path):
+        """讓解碼器直接輸出縮圖尺寸（JPEG 可於 DCT 階段 1/2~1/8 縮放），不先解出整張原圖"""
+        reader = QImageReader(path)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(350, 200, Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if not image.isNull():
+                return QPixmap.fromImage(image)
+        return QPixmap(path).scaled(350, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
     def preview_video(self):
         if not self.video_file:
             QMessageBox.warning(self, "警告", "請先選擇影片檔案")
             return
         try:
-            # 以 ffmpeg 擷取首幀縮圖到暫存，簡化處理
-            tmp = os.path.join(tempfile.gettempdir(), f"vw2_{uuid.uuid4().hex}.jpg")
-            subprocess.run([self.env.ffmpeg_path, '-y', '-ss', '0', '-i', self.video_file, '-frames:v', '1', tmp], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            if os.path.exists(tmp):
-                img = QPixmap(tmp)
-                self.preview_label.setPixmap(img.scaled(350, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-                try:
-                    os.remove(tmp)
-                except Exception:
-                    pass
-        except Exception:
+            key = self._pix_key(self.video_file)
+        except OSError:
             self.preview_label.setText("無法預覽影片")
+            return
+        pix = QPixmapCache.find(key)
+        if pix is not None:
+            # 命中快取：不啟動 ffmpeg、不讀磁碟
+            self.preview_label.setPixmap(pix)
+            return
+        # 未命中：於背景擷取首幀，完成後再顯示；較新的請求會使舊結果失效
+        self._preview_gen += 1
+        self.preview_label.setText("讀取中…")
+        worker = PreviewFrameThread(self._preview_gen, key, self.env.ffmpeg_path, self.env.ffprobe_path, self.video_file)
+        worker.grabbed.connect(self._on_preview_grabbed)
+        worker.finished.connect(lambda w=worker: self._preview_threads.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._preview_threads.add(worker)
+        worker.start()
+
+    def _on_preview_grabbed(self, gen, key, image):
+        pix = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+        if not pix.isNull():
+            QPixmapCache.insert(key, pix)
+        if gen != self._preview_gen:
+            return  # 使用者已改看其他預覽
+        if pix.isNull():
+            self.preview_label.setText("無法預覽影片")
+        else:
+            self.preview_label.setPixmap(pix)
 
     def preview_end(self):
         if not self.end_image_file:
             QMessageBox.warning(self, "警告", "請先選擇結尾圖片")
             return
-        img = QPixmap(self.end_image_file)
-        self.preview_label.setPixmap(img.scaled(350, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        self._preview_gen += 1  # 讓尚在背景擷取的影片預覽不覆蓋此圖
+        self.preview_label.setPixmap(self._cached_scaled_pixmap(self.end_image_file))
 
     def add_to_queue(self):
         if not self.video_file:
@@ -1918,14 +2774,31 @@ class VideoEditorFFApp(QMainWindow):
             pass
 
     def process_next_in_queue(self):
-        if not self.job_queue or len(self.active_processors) >= self.MAX_CONCURRENT_JOBS:
-            return
+        # 一次補滿所有空閒的處理槽
+        while self.job_queue and len(self.active_processors) < self.MAX_CONCURRENT_JOBS:
+            self._start_next_job()
+
+    def _compute_concurrency(self):
+        """預設同時處理數：VideoToolbox 的同時編碼 session 有限，軟體編碼則依核心數"""
+        cpu_count = os.cpu_count() or 2
+        if self.use_hardware and 'h264_videotoolbox' in self.env.hardware_encoders:
+            return max(1, min(cpu_count // 4, 2))
+        return max(1, cpu_count // 2)
+
+    def on_concurrency_changed(self):
+        self._concurrency_user_set = True
+        self.MAX_CONCURRENT_JOBS = self.batch_settings.concurrency
+        self.process_next_in_queue()
 
+    def _start_next_job(self):
         processor_args = self.job_queue.pop(0)
+        processor_args['threads'] = max(1, (os.cpu_count() or 2) // self.MAX_CONCURRENT_JOBS)
         job_id = processor_args['job_id']
+        if processor_args.get('tmp_root'):
+            # 批次工作使用可重用的暫存目錄，工作結束後歸還
+            processor_args['scratch_dir'] = self.batch_manager.acquire_scratch()
+            self._job_scratch[job_id] = processor_args['scratch_dir']
         # 若模型中找不到相對應項目，仍繼續處理（只是不顯示）
-        if self.jobs_model.find_row_by_id(job_id) < 0:
-            pass
 
         processor = FFmpegWrapperProcessor(**processor_args)
         processor.progress.connect(self.on_job_progress)
@@ -1953,37 +2826,28 @@ class VideoEditorFFApp(QMainWindow):
             self.jobs_model.set_state(job_id, "cancel", "取消中…")
 
     def on_job_progress(self, job_id, progress):
-        row = self.jobs_model.find_row_by_id(job_id)
-        if row >= 0:
-            self.jobs_model.update_progress(job_id, progress)
-        
+        # 重繪由 JobListModel 合併，這裡直接寫入
+        self.jobs_model.update_progress(job_id, progress)
         # 同時更新批次管理器
-        if hasattr(self, 'batch_manager'):
-            self.batch_manager.update_job_progress(job_id, progress)
+        self.batch_manager.update_job_progress(job_id, progress)
 
     def on_job_status(self, job_id, status):
-        row = self.jobs_model.find_row_by_id(job_id)
-        if row >= 0:
-            # running 狀態
-            self.jobs_model.set_state(job_id, "running", status)
+        # running 狀態（set_state 找不到列時自行略過）
+        self.jobs_model.set_state(job_id, "running", status)
         
         # 同時更新批次管理器
         if hasattr(self, 'batch_manager'):
             self.batch_manager.update_job_progress(job_id, 0, status)
 
     def on_job_finished(self, job_id, output_file):
-        row = self.jobs_model.find_row_by_id(job_id)
-        if row >= 0:
-            self.jobs_model.set_state(job_id, "done", "完成", output_file)
+        self.jobs_model.set_state(job_id, "done", "完成", output_file)
         
         # 同時更新批次管理器
         if hasattr(self, 'batch_manager'):
             self.batch_manager.update_job_progress(job_id, 100, "完成")
 
     def on_job_error(self, job_id, error_message):
-        row = self.jobs_model.find_row_by_id(job_id)
-        if row >= 0:
-            self.jobs_model.set_state(job_id, "error", f"錯誤: {error_message}")
+        self.jobs_model.set_state(job_id, "error", f"錯誤: {error_message}")
         
         # 同時更新批次管理器
         if hasattr(self, 'batch_manager'):
@@ -1992,6 +2856,9 @@ class VideoEditorFFApp(QMainWindow):
     def on_thread_finished(self, job_id):
         if job_id in self.active_processors:
             del self.active_processors[job_id]
+        scratch = self._job_scratch.pop(job_id, None)
+        if scratch:
+            self.batch_manager.release_scratch(scratch)
         self.update_active_count()
         self.process_next_in_queue()
         
@@ -2023,46 +2890,53 @@ class VideoEditorFFApp(QMainWindow):
         if hasattr(self, 'batch_active_count_label'):
             self.batch_active_count_label.setText(f"進行中: {active_count}")
 
+    # 狀態標籤樣式：(圖示, 樣式表)，依來源字串分類
+    _SOURCE_STYLE_OK = ("✅", "color: #4caf50; font-size: 12px;")
+    _SOURCE_STYLE_WARN = ("⚠️", "color: #ff9800; font-size: 12px;")
+    _SOURCE_STYLE_ERR = ("❌", "color: #f44336; font-size: 12px;")
+
+    @classmethod
+    def _source_style(cls, source):
+        if "內建" in source:
+            return cls._SOURCE_STYLE_OK
+        if "系統" in source:
+            return cls._SOURCE_STYLE_WARN
+        return cls._SOURCE_STYLE_ERR
+
+    def _apply_source_label(self, label, name, source):
+        icon, style = self._source_style(source)
+        label.setText(f"{name}: {icon} {source}")
+        label.setStyleSheet(style)
+
     def update_ffmpeg_status(self):
-        """更新 FFmpeg 狀態顯示"""
+        """更新 FFmpeg 狀態顯示；偵測結果未變時不重新套用樣式表"""
+        state = (getattr(self.env, 'ffmpeg_source', None), getattr(self.env, 'ffprobe_source', None),
+                 getattr(self.env, 'ffmpeg_path', None), getattr(self.env, 'ffprobe_path', None))
+        if state == self._ffmpeg_status_cache:
+            return
+        self._ffmpeg_status_cache = state
+        ffmpeg_source, ffprobe_source, ffmpeg_path, ffprobe_path = state
         try:
-            # 更新 FFmpeg 狀態
-            if hasattr(self.env, 'ffmpeg_source'):
-                if "內建" in self.env.ffmpeg_source:
-                    self.ffmpeg_status_label.setText(f"FFmpeg: ✅ {self.env.ffmpeg_source}")
-                    self.ffmpeg_status_label.setStyleSheet("color: #4caf50; font-size: 12px;")
-                elif "系統" in self.env.ffmpeg_source:
-                    self.ffmpeg_status_label.setText(f"FFmpeg: ⚠️ {self.env.ffmpeg_source}")
-                    self.ffmpeg_status_label.setStyleSheet("color: #ff9800; font-size: 12px;")
-                else:
-                    self.ffmpeg_status_label.setText(f"FFmpeg: ❌ {self.env.ffmpeg_source}")
-                    self.ffmpeg_status_label.setStyleSheet("color: #f44336; font-size: 12px;")
-            
-            # 更新 FFprobe 狀態
-            if hasattr(self.env, 'ffprobe_source'):
-                if "內建" in self.env.ffprobe_source:
-                    self.ffprobe_status_label.setText(f"FFprobe: ✅ {self.env.ffprobe_source}")
-                    self.ffprobe_status_label.setStyleSheet("color: #4caf50; font-size: 12px;")
-                elif "系統" in self.env.ffprobe_source:
-                    self.ffprobe_status_label.setText(f"FFprobe: ⚠️ {self.env.ffprobe_source}")
-                    self.ffprobe_status_label.setStyleSheet("color: #ff9800; font-size: 12px;")
-                else:
-                    self.ffprobe_status_label.setText(f"FFprobe: ❌ {self.env.ffprobe_source}")
-                    self.ffprobe_status_label.setStyleSheet("color: #f44336; font-size: 12px;")
-            
+            # 更新 FFmpeg / FFprobe 狀態
+            if ffmpeg_source is not None:
+                self._apply_source_label(self.ffmpeg_status_label, "FFmpeg", ffmpeg_source)
+            if ffprobe_source is not None:
+                self._apply_source_label(self.ffprobe_status_label, "FFprobe", ffprobe_source)
+
             # 更新路徑信息
             path_info = []
-            if hasattr(self.env, 'ffmpeg_path') and self.env.ffmpeg_path:
-                path_info.append(f"FFmpeg: {self.env.ffmpeg_path}")
-            if hasattr(self.env, 'ffprobe_path') and self.env.ffprobe_path:
-                path_info.append(f"FFprobe: {self.env.ffprobe_path}")
-            
+            if ffmpeg_path:
+                path_info.append(f"FFmpeg: {ffmpeg_path}")
+            if ffprobe_path:
+                path_info.append(f"FFprobe: {ffprobe_path}")
+
             if path_info:
                 self.ffmpeg_path_label.setText("路徑:\n" + "\n".join(path_info))
             else:
                 self.ffmpeg_path_label.setText("路徑: 未找到")
-                
+
         except Exception as e:
+            self._ffmpeg_status_cache = None
             self.ffmpeg_status_label.setText(f"FFmpeg: ❌ 錯誤")
             self.ffprobe_status_label.setText(f"FFprobe: ❌ 錯誤")
             self.ffmpeg_path_label.setText(f"路徑: 錯誤 - {str(e)}")
@@ -2074,9 +2948,7 @@ class VideoEditorFFApp(QMainWindow):
             if item.state == "running" or item.state == "queued":
                 kept.append(item)
         if len(kept) != len(self.jobs_model.items):
-            self.jobs_model.beginResetModel()
-            self.jobs_model.items = kept
-            self.jobs_model.endResetModel()
+            self.jobs_model.replace_items(kept)
 
     # --- Jobs view interactions ---
     def on_jobs_double_clicked(self, index: QModelIndex):
@@ -2086,7 +2958,7 @@ class VideoEditorFFApp(QMainWindow):
         if item.state in ("running", "queued"):
             self.cancel_job(item.job_id)
         elif item.state == "done" and item.output_file and os.path.exists(item.output_file):
-            subprocess.run(["open", "-R", item.output_file])
+            reveal_in_finder(item.output_file)
 
     def on_jobs_context_menu(self, pos):
         index = self.jobs_view.indexAt(pos)
@@ -2106,9 +2978,9 @@ class VideoEditorFFApp(QMainWindow):
             act_remove = menu.addAction("自列表移除")
             act = menu.exec(self.jobs_view.mapToGlobal(pos))
             if act == act_open and item.output_file and os.path.exists(item.output_file):
-                subprocess.run(["open", item.output_file])
+                open_with_default_app(item.output_file)
             elif act == act_reveal and item.output_file:
-                subprocess.run(["open", "-R", item.output_file])
+                reveal_in_finder(item.output_file)
             elif act == act_remove:
                 self.jobs_model.remove_row(index.row())
     def clear_selection(self):
@@ -2128,6 +3000,7 @@ class VideoEditorFFApp(QMainWindow):
             self.auto_output_checkbox.setChecked(True)
         if hasattr(self, 'end_btn'):
             self.end_btn.setEnabled(True)
+        self._preview_gen += 1
         self.preview_label.clear()
         self.preview_label.setText("請選擇檔案進行預覽")
         self.info_text.setText("檔案資訊將顯示在此處...")
@@ -2158,11 +3031,15 @@ class VideoEditorFFApp(QMainWindow):
                     elif not self.end_image_file:
                         self.end_image_file = path
                         self.end_label.setText(os.path.basename(path))
-            self.update_info_display()
-            self.check_all_files_selected()
+            # 連續拖放時只在最後一次之後刷新一次
+            self._ui_refresh_timer.start()
         except Exception:
             pass
 
+    def _do_ui_refresh(self):
+        self.update_info_display()
+        self.check_all_files_selected()
+
     # --- 同圖選項邏輯 ---
     def on_same_image_changed(self, state):
         if state == 2:
@@ -2201,7 +3078,7 @@ class VideoEditorFFApp(QMainWindow):
             event.ignore()
 
     # --- 預覽切換 ---
-    def toggle_preview_group(self):
+    def toggle_preview_group(self, _state=None):
         if hasattr(self, 'preview_group') and self.preview_group:
             self.preview_group.setVisible(self.chk_show_preview.isChecked())
 
@@ -2232,11 +3109,28 @@ class VideoEditorFFApp(QMainWindow):
             QMessageBox.warning(self, "警告", "請先掃描檔案")
             return
         
+        # 先於背景平行探測所有主片，完成後才建立批次並排入佇列
+        self.batch_process_btn.setEnabled(False)
+        self.batch_process_btn.setText("探測影片參數...")
+        matched_pairs = list(self.current_matched_pairs)
+        output_folder = self.batch_settings.output_folder
+        paths = list(dict.fromkeys(video_path for video_path, _ in matched_pairs))
+        worker = BatchProbeThread(self.env.ffprobe_path, paths)
+        worker.probed.connect(lambda infos: self._queue_batch(matched_pairs, output_folder, infos))
+        worker.finished.connect(lambda w=worker: self._probe_threads.discard(w))
+        worker.finished.connect(worker.deleteLater)
+        self._probe_threads.add(worker)
+        worker.start()
+
+    def _queue_batch(self, matched_pairs, output_folder, probe_infos):
+        """探測完成後建立批次並將工作加入佇列"""
         # 建立批次
-        batch_id = self.batch_manager.create_batch(self.current_matched_pairs, self.batch_settings.output_folder)
+        batch_id = self.batch_manager.create_batch(matched_pairs, output_folder, probe_infos=probe_infos)
         
         # 將所有工作加入佇列
+        tmp_root = self.batch_manager.ensure_tmp_root()
         batch_jobs = self.batch_manager.get_current_batch()
+        job_items = []
         for job in batch_jobs:
             # 批次模式固定使用相同的圖片作為開頭和結尾，固定3秒
             processor_args = {
@@ -2250,17 +3144,20 @@ class VideoEditorFFApp(QMainWindow):
                 'prefer_copy_concat': self.prefer_copy_concat,
                 'use_hardware': self.use_hardware,
                 'env': self.env,
+                'probe_info': job.probe_info,
+                'tmp_root': tmp_root,
             }
             
             # 加入佇列
             self.job_queue.append(processor_args)
             
-            # 加入模型
             job_name = f"批次: {os.path.basename(job.video_path)}"
             job_item = JobItem(job.job_id, job_name)
-            self.jobs_model.add_item(job_item)
-            self.jobs_model.set_state(job.job_id, "queued", "已加入佇列…")
-        
+            job_item.status_text = "已加入佇列…"
+            job_items.append(job_item)
+
+        # 整批一次加入模型
+        self.jobs_model.add_items(job_items)
         self.update_queue_count()
         self.process_next_in_queue()
         
@@ -2283,9 +3180,20 @@ class VideoEditorFFApp(QMainWindow):
                 return
 
         self.job_queue.clear()
-        for job_id, processor in list(self.active_processors.items()):
+        # 背景探測只讀檔頭，等它們結束即可，避免 QThread 在執行中被銷毀
+        for worker in list(self._probe_threads):
+            worker.wait()
+        # 先通知所有工作取消，讓它們並行結束，再以有限時間等待
+        processors = list(self.active_processors.values())
+        for processor in processors:
             processor.cancel()
-            processor.wait()
+        for processor in processors:
+            if not processor.wait(2000):
+                # 逾時：再次終止其 ffmpeg（取消後才啟動的子程序也一併處理），並等到執行緒真正結束，
+                # 否則 QThread 會在執行中被銷毀，暫存目錄也會在工作仍寫入時被刪除
+                processor.cancel()
+                processor.wait()
+        self.batch_manager.cleanup()
         event.accept()
 
 